@@ -0,0 +1,128 @@
+from argparse import ArgumentParser
+from sources import heuristics, solver, benchmark
+import signal
+import json
+import sys
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        prog="benchmark",
+        description="Benchmark the n-puzzle solvers and compare them to a baseline."
+    )
+
+    parser.add_argument(
+        "--algorithm",
+        type=str,
+        help="Choose the solver algorithm(s). Defaults to all of them.",
+        choices=solver.NAMES,
+        default=list(solver.NAMES),
+        nargs='+'
+    )
+    parser.add_argument(
+        "--heuristic",
+        type=str,
+        help="Choose the heuristic function(s). Defaults to all of them.",
+        choices=heuristics.NAMES,
+        default=list(heuristics.NAMES),
+        nargs='+'
+    )
+    parser.add_argument(
+        "--cases",
+        metavar="GLOB",
+        type=str,
+        help="Glob pattern of the puzzle files. Defaults to tests/valid/*.",
+        default="tests/valid/*"
+    )
+    parser.add_argument(
+        "--generated",
+        metavar="N",
+        help="Number of seeded random puzzles of each size. Defaults to 5.",
+        type=int,
+        default=5
+    )
+    parser.add_argument(
+        "--sizes",
+        metavar="N",
+        type=str,
+        help="Dimensions of the random puzzles. Defaults to 3x3.",
+        default=["3x3"],
+        nargs='+'
+    )
+    parser.add_argument(
+        "--seed",
+        help="Seed of the random puzzles. Defaults to 42.",
+        type=int,
+        default=42
+    )
+    parser.add_argument(
+        "--repeat",
+        help="Number of runs of each case. Defaults to 3.",
+        type=int,
+        default=3
+    )
+    parser.add_argument(
+        "--timeout",
+        metavar="SECONDS",
+        help="Time limit of each run. Defaults to 10.",
+        type=float,
+        default=10
+    )
+    parser.add_argument(
+        "--output",
+        metavar="PATH",
+        type=str,
+        help="Write the results as a JSON baseline.",
+        default=None
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="PATH",
+        type=str,
+        help="Compare the results to a JSON baseline, failing on regressions.",
+        default=None
+    )
+    parser.add_argument(
+        "--threshold",
+        help="Allowed relative growth of time and nodes against the baseline. Defaults to 0.2.",
+        type=float,
+        default=0.2
+    )
+
+    args = parser.parse_args()
+
+    try:
+        signal.signal(signal.SIGINT, lambda *_: (print("\033[2Dbenchmark: error: computation ended by user."), exit(1)))
+
+        baseline = None
+        if args.baseline is not None:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+
+        cases = benchmark.cases(args.cases, args.generated, args.sizes, args.seed)
+        results = {}
+        for key, record in benchmark.run(args.algorithm, args.heuristic, cases, args.repeat, args.timeout):
+            results[key] = record
+            if record["status"] == "ok":
+                print(
+                    f"{key}: {record['moves']} moves, median {record['median']:.4f}s, p95 {record['p95']:.4f}s, "
+                    f"{record['nodes']} nodes, {record['nodes_per_second'] or 0:.0f} nodes/s, {record['peak_rss']} KiB"
+                )
+            else:
+                print(f"{key}: {record['status']}{': ' + record['error'] if 'error' in record else ''}")
+
+        if args.output is not None:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+
+        if baseline is not None:
+            regressions = benchmark.compare(results, baseline, args.threshold)
+            print(f"\n{len(regressions)} regression{'s' if len(regressions) != 1 else ''} against {args.baseline}")
+            for regression in regressions:
+                print(regression)
+            if regressions:
+                exit(1)
+
+    except Exception as ex:
+        print(f"benchmark: {ex.__class__.__name__}: {ex}", file=sys.stderr)
+        exit(1)
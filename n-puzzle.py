@@ -1,6 +1,7 @@
 from argparse import ArgumentParser, FileType
-from sources import heuristics, visualizer, generator, parsing, solver, utils
+from sources import heuristics, visualizer, generator, parsing, solver, utils, pattern_database, batch, profiling, solution_cache, server
 import signal
+import json
 import time
 import sys
 
@@ -26,6 +27,18 @@ if __name__ == "__main__":
         default=None,
         help="Path for the puzzle file."
     )
+    group.add_argument(
+        "--batch",
+        metavar="DIR|GLOB",
+        type=str,
+        help="Solve every puzzle file of a directory or glob pattern over a pool of processes, printing JSON lines."
+    )
+    group.add_argument(
+        "--serve",
+        metavar="ADDRESS",
+        type=str,
+        help="Serve JSON solve requests over HTTP on a Unix socket (path) or a localhost port (PORT or HOST:PORT)."
+    )
 
     parser.add_argument(
         "--goal",
@@ -66,12 +79,123 @@ if __name__ == "__main__":
         default=[heuristics.DEFAULT],
         nargs='+'
     )
+    parser.add_argument(
+        "--buckets",
+        help="Use a bucket queue instead of a binary heap as open list of A* based algorithms (integer heuristics only).",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--transposition-table",
+        metavar="N",
+        help="Size of the transposition table of id_astar_rec. Defaults to 0 (disabled).",
+        type=int,
+        default=0
+    )
+    parser.add_argument(
+        "--move-pruning",
+        metavar="L",
+        help="Prune duplicate move sequences of up to L moves in id_astar_rec. Defaults to 2 (undoing moves).",
+        type=int,
+        default=2
+    )
+    parser.add_argument(
+        "--max-memory",
+        metavar="MB",
+        help="Memory budget of astar, greedy and uniform_cost, continuing with id_astar once exceeded.",
+        type=float,
+        default=None
+    )
+    parser.add_argument(
+        "--time-limit",
+        metavar="SECONDS",
+        help="Time after which ara_star returns its best path found, with its suboptimality bound.",
+        type=float,
+        default=None
+    )
+    parser.add_argument(
+        "--request-timeout",
+        metavar="SECONDS",
+        help="Default and longest time limit of the requests of --serve, the worker solving it is restarted past it. Defaults to 30.",
+        type=float,
+        default=30
+    )
+    parser.add_argument(
+        "--slab",
+        metavar="N",
+        help="Number of states of batch_astar expanded and scored together (requires NumPy). Defaults to 256.",
+        type=int,
+        default=256
+    )
+    parser.add_argument(
+        "--jobs",
+        metavar="N",
+        help="Number of worker processes of parallel_id_astar, --batch and --serve. Defaults to the number of CPUs.",
+        type=int,
+        default=None
+    )
+    parser.add_argument(
+        "--profile",
+        help="Print timers and counters of the search as JSON (astar, greedy and uniform_cost).",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--pdb-cache",
+        metavar="DIR",
+        type=str,
+        help=f"Directory where pattern databases are cached, empty to disable. Defaults to {pattern_database.CACHE_DIR}.",
+        default=pattern_database.CACHE_DIR
+    )
+    parser.add_argument(
+        "--solution-cache",
+        metavar="FILE",
+        type=str,
+        nargs="?",
+        const="",
+        help="Reuse the solutions stored in an SQLite file, optimal ones answering any algorithm. Defaults to solutions.sqlite3 in the pattern database cache directory.",
+        default=None
+    )
 
     args = parser.parse_args()
+    pattern_database.CACHE_DIR = args.pdb_cache or None
 
     try:
         signal.signal(signal.SIGINT, lambda *_: (print("\033[2Dn-puzzle: error: computation ended by user."), exit(1)))
 
+        if args.batch is not None:
+            goal = None
+            if args.goal is not None:
+                goal = parsing.parse_puzzle(parsing.deserialize_puzzle(args.goal))
+
+            records = batch.run(
+                batch.expand(args.batch),
+                args.algorithm,
+                args.heuristic,
+                goal,
+                args.jobs,
+                buckets=args.buckets,
+                transposition_size=args.transposition_table,
+                pruning_length=args.move_pruning,
+                slab=args.slab,
+            )
+            for record in records:
+                print(json.dumps(record), flush=True)
+            exit(0)
+
+        if args.serve is not None:
+            pool = server.Pool(
+                args.jobs,
+                args.request_timeout,
+                None if args.solution_cache is None else args.solution_cache or solution_cache.default_path(),
+                buckets=args.buckets,
+                transposition_size=args.transposition_table,
+                pruning_length=args.move_pruning,
+                slab=args.slab,
+            )
+            http = server.serve(args.serve, pool)
+            signal.signal(signal.SIGINT, lambda *_: (pool.close(), exit(0)))
+            print(f"Listening on {args.serve}", flush=True)
+            http.serve_forever()
+
         if args.generate is None:
             raw_puzzle = parsing.deserialize_puzzle(args.puzzle)
             height, width, puzzle = parsing.parse_puzzle(raw_puzzle)
@@ -101,6 +225,7 @@ if __name__ == "__main__":
         # utils.print_puzzle(goal, size)
 
         scores = {}
+        cache = None if args.solution_cache is None else solution_cache.SolutionCache(args.solution_cache)
 
         for algo_name in args.algorithm:
             algorithm = solver.NAMES[algo_name]
@@ -109,8 +234,28 @@ if __name__ == "__main__":
 
                 print()
                 print(f"Searching for a solution using {algo_name} algorithm and {heur_name} heuristic.")
+                profile = profiling.Profile() if args.profile else None
                 start = time.time()
-                solution, time_complexity, space_complexity = algorithm(tuple(puzzle), height, width, tuple(goal), heuristic)
+                bounds = []
+                hits = 0 if cache is None else cache.hits
+                solution, time_complexity, space_complexity = solver.run(
+                    algorithm,
+                    tuple(puzzle),
+                    height,
+                    width,
+                    tuple(goal),
+                    heuristic,
+                    cache=cache,
+                    buckets=args.buckets,
+                    transposition_size=args.transposition_table,
+                    pruning_length=args.move_pruning,
+                    jobs=args.jobs,
+                    slab=args.slab,
+                    profile=profile,
+                    max_memory=None if args.max_memory is None else int(args.max_memory * 2**20),
+                    time_limit=args.time_limit,
+                    on_solution=lambda path, bound: bounds.append(bound),
+                )
                 end = time.time()
 
                 scores[(algo_name, heur_name)] = (end - start, len(solution), time_complexity, space_complexity)
@@ -118,8 +263,16 @@ if __name__ == "__main__":
                 print(f"Solution of {len(solution)} moves found in {end - start:.3f}s")
                 print("Time Complexity:", time_complexity)
                 print("Space Complexity:", space_complexity)
+                print(f"Peak Memory: {utils.peak_memory() / 2**20:.1f} MB")
+                if cache is not None:
+                    print(f"Solution Cache: {'hit' if cache.hits > hits else 'miss'}")
+                if bounds:
+                    print(f"Suboptimality Bound: {bounds[-1]:.3f}")
                 print("Moves:", *solution if solution else (None,))
 
+                if profile is not None and profile.timers:
+                    print("Profile:", json.dumps(profile.report()))
+
                 if args.verbose:
                     utils.print_moves(puzzle, height, width, solution)
 
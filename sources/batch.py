@@ -0,0 +1,136 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import multiprocessing
+import signal
+import glob
+import time
+import os
+from . import generator, heuristics, parsing, solver, utils
+
+
+# State of the batch worker, set by _init_worker and kept warm between puzzles
+_worker: Dict = {}
+
+
+def expand(pattern: str) -> List[str]:
+    """Get the puzzle files of a batch
+
+    Args:
+        pattern (str): Directory (every file inside it) or glob pattern
+
+    Returns:
+        List[str]: Sorted paths of the puzzle files
+    """
+
+    if os.path.isdir(pattern):
+        paths = (entry.path for entry in os.scandir(pattern) if entry.is_file())
+    else:
+        paths = (path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(paths)
+
+
+def _init_worker(goal: Optional[Tuple[int, int, List[int]]], options: Dict) -> None:
+    """Set up a batch worker process
+
+    Args:
+        goal (Optional[Tuple[int, int, List[int]]]): Height, width and state of the custom goal, None for spiral goals
+        options (Dict): Solver options (see solver.run)
+    """
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker.update(goal=goal, options=options, goals={})
+
+
+def _goal(height: int, width: int) -> Tuple[int, ...]:
+    """Get the goal of a puzzle, computed once per dimensions in each worker
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+
+    Raises:
+        RuntimeError: If the custom goal has other dimensions
+
+    Returns:
+        Tuple[int, ...]: Goal state
+    """
+
+    goals = _worker["goals"]
+    if (height, width) not in goals:
+        custom = _worker["goal"]
+        if custom is None:
+            goals[height, width] = tuple(generator.make_goal(height, width))
+        elif custom[:2] == (height, width):
+            goals[height, width] = tuple(custom[2])
+        else:
+            raise RuntimeError("Invalid goal dimensions")
+    return goals[height, width]
+
+
+def solve(task: Tuple[str, str, str]) -> Dict:
+    """Solve a puzzle file with an algorithm and a heuristic in a batch worker
+
+    Errors are reported in the result rather than raised, so that one invalid file does not stop the batch.
+
+    Args:
+        task (Tuple[str, str, str]): Path of the puzzle file, algorithm name and heuristic name
+
+    Returns:
+        Dict: Result record, with the moves, time, nodes and peak states or the error
+    """
+
+    path, algo_name, heur_name = task
+    record = {"file": path, "algorithm": algo_name, "heuristic": heur_name}
+    try:
+        with open(path) as puzzle_file:
+            height, width, puzzle = parsing.parse_puzzle(parsing.deserialize_puzzle(puzzle_file))
+        goal = _goal(height, width)
+        if not utils.is_solvable(puzzle, goal, width):
+            raise RuntimeError("Puzzle is not solvable")
+
+        start = time.perf_counter()
+        solution, time_complexity, space_complexity = solver.run(
+            solver.NAMES[algo_name],
+            tuple(puzzle),
+            height,
+            width,
+            goal,
+            heuristics.NAMES[heur_name],
+            **_worker["options"],
+        )
+        end = time.perf_counter()
+
+        record.update(moves=solution, time=end - start, nodes=time_complexity, peak_states=space_complexity)
+    except Exception as ex:
+        record["error"] = f"{ex.__class__.__name__}: {ex}"
+    return record
+
+
+def run(
+    paths: Sequence[str],
+    algorithms: Sequence[str],
+    heuristic_names: Sequence[str],
+    goal: Optional[Tuple[int, int, List[int]]] = None,
+    jobs: Optional[int] = None,
+    **options,
+) -> Iterator[Dict]:
+    """Solve puzzle files over a pool of worker processes
+
+    Each worker keeps its goals, pattern databases and move pruning automata between puzzles,
+    so the setup cost is paid once per worker instead of once per file.
+
+    Args:
+        paths (Sequence[str]): Paths of the puzzle files
+        algorithms (Sequence[str]): Names of the algorithms (see solver.NAMES)
+        heuristic_names (Sequence[str]): Names of the heuristics (see heuristics.NAMES)
+        goal (Optional[Tuple[int, int, List[int]]], optional): Height, width and state of a custom goal. Defaults to spiral goals.
+        jobs (Optional[int], optional): Number of worker processes. Defaults to the number of CPUs.
+        **options: Solver options (see solver.run), workers run parallel_id_astar on a single job
+
+    Yields:
+        Dict: Result record of each (file, algorithm, heuristic), in completion order
+    """
+
+    options["jobs"] = 1
+    tasks = [(path, algo_name, heur_name) for path in paths for algo_name in algorithms for heur_name in heuristic_names]
+    with multiprocessing.Pool(jobs, initializer=_init_worker, initargs=(goal, options)) as pool:
+        yield from pool.imap_unordered(solve, tasks)
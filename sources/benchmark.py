@@ -0,0 +1,214 @@
+from typing import Dict, Iterator, List, Sequence, Tuple
+from statistics import median
+import multiprocessing
+import random
+import signal
+import glob
+import math
+import time
+import os
+from . import generator, parsing, solver, utils
+
+
+Case = Tuple[str, int, int, Tuple[int, ...], Tuple[int, ...]]
+
+# Regressions smaller than this many seconds are measurement noise
+TIME_SLACK = 0.005
+
+# Seconds allowed to build or load the tables of a case (e.g. a cold 4x4 pattern database) before its runs
+SETUP_TIMEOUT = 600
+
+
+def cases(pattern: str = "tests/valid/*", generated: int = 5, sizes: Sequence[str] = ("3x3",), seed: int = 42) -> List[Case]:
+    """Get the benchmark cases, from puzzle files and seeded random puzzles
+
+    Args:
+        pattern (str, optional): Glob pattern of the puzzle files. Defaults to "tests/valid/*".
+        generated (int, optional): Number of random puzzles of each size. Defaults to 5.
+        sizes (Sequence[str], optional): Dimensions of the random puzzles, as N or NxM. Defaults to ("3x3",).
+        seed (int, optional): Seed of the random puzzles. Defaults to 42.
+
+    Returns:
+        List[Case]: Name, height, width, puzzle and goal of each solvable case
+    """
+
+    result = []
+    for path in sorted(glob.glob(pattern)):
+        if not os.path.isfile(path):
+            continue
+        with open(path) as puzzle_file:
+            height, width, puzzle = parsing.parse_puzzle(parsing.deserialize_puzzle(puzzle_file))
+        goal = generator.make_goal(height, width)
+        if utils.is_solvable(puzzle, goal, width):
+            result.append((path, height, width, tuple(puzzle), tuple(goal)))
+
+    state = random.getstate()
+    random.seed(seed)
+    for size in sizes:
+        height, width = parsing.parse_dimensions(size)
+        goal = generator.make_goal(height, width)
+        for i in range(generated):
+            puzzle = generator.generate(height, width, goal)
+            result.append((f"random/{height}x{width}-{seed}-{i}", height, width, tuple(puzzle), tuple(goal)))
+    random.setstate(state)
+
+    return result
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Get a percentile of values by the nearest-rank method
+
+    Args:
+        values (Sequence[float]): Values, not empty
+        p (float): Percentile between 0 and 100
+
+    Returns:
+        float: Smallest value greater than or equal to p percent of the values
+    """
+
+    values = sorted(values)
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def _measure(connection, algo_name: str, heur_name: str, case: Case, repeat: int) -> None:
+    """Solve a case several times in a child process, sending the moves, nodes and time of each run
+
+    None is sent once the tables of the case are ready, and again after an untimed warm-up run.
+
+    Args:
+        connection (Connection): Pipe to the parent process
+        algo_name (str): Name of the algorithm
+        heur_name (str): Name of the heuristic
+        case (Case): Benchmark case
+        repeat (int): Number of runs
+    """
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _, height, width, puzzle, goal = case
+    try:
+        instance = solver.Solver(height, width, goal, algo_name, heur_name, jobs=1)
+        connection.send(None)
+        instance.solve(puzzle)
+        connection.send(None)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            solution, time_complexity, _ = instance.solve(puzzle)
+            end = time.perf_counter()
+            connection.send((len(solution), time_complexity, end - start, utils.peak_memory() // 1024))
+    except Exception as ex:
+        connection.send(f"{ex.__class__.__name__}: {ex}")
+    connection.close()
+
+
+def measure(algo_name: str, heur_name: str, case: Case, repeat: int = 3, timeout: float = 10) -> Dict:
+    """Benchmark an algorithm and a heuristic on a case
+
+    Runs happen in a fresh process, so that the peak memory belongs to the case and a run exceeding
+    the timeout can be killed. The tables of the case are built or loaded first, within SETUP_TIMEOUT, and
+    an untimed run warms the process up, so that every timed run is a warm one.
+
+    Args:
+        algo_name (str): Name of the algorithm
+        heur_name (str): Name of the heuristic
+        case (Case): Benchmark case
+        repeat (int, optional): Number of runs. Defaults to 3.
+        timeout (float, optional): Time limit of each run in seconds. Defaults to 10.
+
+    Returns:
+        Dict: Status, solution length, median and 95th percentile time, nodes, nodes per second and peak RSS in KiB
+    """
+
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_measure, args=(sender, algo_name, heur_name, case, repeat), daemon=True)
+    process.start()
+    sender.close()
+
+    record = {"status": "ok"}
+    runs = []
+    wait = SETUP_TIMEOUT
+    try:
+        while len(runs) < repeat:
+            if not receiver.poll(wait):
+                record["status"] = "timeout"
+                break
+            run = receiver.recv()
+            if isinstance(run, str):
+                record.update(status="error", error=run)
+                break
+            wait = timeout
+            if run is not None:
+                runs.append(run)
+    except EOFError:
+        record["status"] = "error"
+    finally:
+        process.kill()
+        process.join()
+        receiver.close()
+
+    if record["status"] == "ok":
+        times = [t for _, _, t, _ in runs]
+        moves, nodes = runs[0][:2]
+        record.update(
+            moves=moves,
+            nodes=nodes,
+            median=median(times),
+            p95=percentile(times, 95),
+            nodes_per_second=nodes / median(times) if median(times) else None,
+            peak_rss=max(peak for *_, peak in runs),
+        )
+    return record
+
+
+def run(
+    algorithms: Sequence[str], heuristic_names: Sequence[str], benchmark_cases: Sequence[Case], repeat: int = 3, timeout: float = 10
+) -> Iterator[Tuple[str, Dict]]:
+    """Benchmark every algorithm and heuristic pair on every case
+
+    Args:
+        algorithms (Sequence[str]): Names of the algorithms (see solver.NAMES)
+        heuristic_names (Sequence[str]): Names of the heuristics (see heuristics.NAMES)
+        benchmark_cases (Sequence[Case]): Benchmark cases
+        repeat (int, optional): Number of runs of each case. Defaults to 3.
+        timeout (float, optional): Time limit of each run in seconds. Defaults to 10.
+
+    Yields:
+        Tuple[str, Dict]: Key ("algorithm/heuristic/case") and record of each benchmark (see measure)
+    """
+
+    for algo_name in algorithms:
+        for heur_name in heuristic_names:
+            for case in benchmark_cases:
+                yield f"{algo_name}/{heur_name}/{case[0]}", measure(algo_name, heur_name, case, repeat, timeout)
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float = 0.2) -> List[str]:
+    """Find the regressions of benchmark results against a baseline
+
+    A benchmark regresses when it fails while it used to succeed, when it finds a longer solution,
+    or when its median time or its nodes grow by more than the threshold. Benchmarks missing on
+    either side are ignored.
+
+    Args:
+        results (Dict[str, Dict]): Current records by key
+        baseline (Dict[str, Dict]): Baseline records by key
+        threshold (float, optional): Allowed relative growth. Defaults to 0.2.
+
+    Returns:
+        List[str]: Description of each regression
+    """
+
+    regressions = []
+    for key, record in results.items():
+        base = baseline.get(key)
+        if base is None or base["status"] != "ok":
+            continue
+        if record["status"] != "ok":
+            regressions.append(f"{key}: {record['status']} (was ok)")
+            continue
+        if record["moves"] > base["moves"]:
+            regressions.append(f"{key}: {record['moves']} moves (was {base['moves']})")
+        if record["median"] > base["median"] * (1 + threshold) and record["median"] - base["median"] > TIME_SLACK:
+            regressions.append(f"{key}: median {record['median']:.4f}s (was {base['median']:.4f}s)")
+        if record["nodes"] > base["nodes"] * (1 + threshold):
+            regressions.append(f"{key}: {record['nodes']} nodes (was {base['nodes']})")
+    return regressions
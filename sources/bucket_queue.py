@@ -0,0 +1,35 @@
+class BucketQueue:
+    """Priority queue of (f, h, ...) entries with small non-negative integer costs, h <= f
+
+    Entries are popped by lowest f, then lowest h (largest g), then last in first out. Each (f, h) pair has
+    its own bucket, so pushing and popping are O(1) amortized and never compare the rest of the entries,
+    unlike heapq. Used as a drop-in for the heaps of the A* based solvers.
+    """
+
+    def __init__(self):
+        self.buckets = []
+        self.lowest = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, entry):
+        f, h = entry[0], entry[1]
+        # Buckets are ordered by (f, h) with 0 <= h <= f
+        key = f * (f + 1) // 2 + h
+        if key >= len(self.buckets):
+            self.buckets.extend([] for _ in range(key + 1 - len(self.buckets)))
+        self.buckets[key].append(entry)
+        if key < self.lowest:
+            self.lowest = key
+        self.size += 1
+
+    def pop(self):
+        buckets = self.buckets
+        lowest = self.lowest
+        while not buckets[lowest]:
+            lowest += 1
+        self.lowest = lowest
+        self.size -= 1
+        return buckets[lowest].pop()
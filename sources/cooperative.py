@@ -0,0 +1,117 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import time
+from . import solver
+
+
+class Search:
+    """Search run in slices on an asyncio event loop
+
+    The search gives control back to the event loop every slice_size explored states (see solver.steps), so that
+    several searches and other tasks share a single thread. It stops with a TimeoutError past its deadline, and
+    with the CancelledError of its task when cancelled, its complexities so far being kept in both cases.
+
+    Attributes:
+        status (str): pending, running, done, timeout or cancelled
+        time_complexity (int): Number of states explored so far
+        space_complexity (int): Number of states in memory at the last pause
+        result (Optional[Tuple[str, int, int]]): Result of the algorithm once done
+    """
+
+    def __init__(
+        self,
+        algorithm: Callable,
+        base_grid: Tuple[int, ...],
+        height: int,
+        width: int,
+        goal: Tuple[int, ...],
+        heuristic: Callable,
+        slice_size: int = 4096,
+        **options: Any
+    ):
+        """
+        Args:
+            algorithm (Callable): Solver algorithm, one of solver.NAMES
+            base_grid (Tuple[int, ...]): Initial state
+            height (int): Number of rows in the puzzle
+            width (int): Number of columns in the puzzle
+            goal (Tuple[int, ...]): Goal state
+            heuristic (Callable): Heuristic function
+            slice_size (int, optional): Number of states explored between two pauses. Defaults to 4096.
+            **options: Keyword arguments of the algorithm (see solver.steps)
+        """
+
+        self.steps = solver.steps(algorithm, base_grid, height, width, goal, heuristic, slice_size, **options)
+        self.status = "pending"
+        self.time_complexity = 0
+        self.space_complexity = 0
+        self.result: Optional[Tuple[str, int, int]] = None
+
+    def step(self) -> bool:
+        """Explore the next slice of the search
+
+        Returns:
+            bool: Whether the search is over
+        """
+
+        if self.status not in ("pending", "running"):
+            return True
+        self.status = "running"
+        try:
+            self.time_complexity, self.space_complexity = next(self.steps)
+        except StopIteration as stop:
+            self.result = stop.value
+            _, self.time_complexity, self.space_complexity = self.result
+            self.status = "done"
+            return True
+        return False
+
+    def cancel(self, status: str = "cancelled") -> None:
+        """Stop the search, releasing its memory
+
+        Args:
+            status (str, optional): Status of the stopped search. Defaults to "cancelled".
+        """
+
+        if self.status in ("pending", "running"):
+            self.steps.close()
+            self.status = status
+
+    async def run(self, timeout: Optional[float] = None) -> Tuple[str, int, int]:
+        """Run the search to its end, giving control back to the event loop between slices
+
+        Args:
+            timeout (Optional[float], optional): Seconds before giving up. Defaults to None.
+
+        Raises:
+            TimeoutError: The search did not finish in time
+            asyncio.CancelledError: The task running the search was cancelled
+
+        Returns:
+            Tuple[str, int, int]: Result of the algorithm (moves, time complexity, space complexity)
+        """
+
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        try:
+            while not self.step():
+                if deadline is not None and time.perf_counter() >= deadline:
+                    self.cancel("timeout")
+                    raise TimeoutError(f"Search timed out after {timeout} seconds")
+                await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+        return self.result
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the progress of the search
+
+        Returns:
+            Dict[str, Any]: Status and complexities so far
+        """
+
+        return {
+            "status": self.status,
+            "time_complexity": self.time_complexity,
+            "space_complexity": self.space_complexity,
+        }
@@ -1,93 +1,431 @@
-from typing import List, Tuple
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from functools import lru_cache
+from bisect import bisect_left
+from . import pattern_database, symmetry, walking_distance as wd
 import math
 
 
-def manhattan(grid: List[int], width: int, gpos: List[Tuple[int, int]]) -> float:
-    res = 0
-    for i, e in enumerate(grid):
-        if e == 0:
-            continue
-        cury, curx = divmod(i, width)
-        targety, targetx = gpos[e]
-        res += abs(curx - targetx) + abs(cury - targety)
-    return res
+# Number of line costs memoized per row or column
+MAX_LINES = 1 << 18
 
 
-def euclidean(grid: List[int], width: int, gpos: List[Tuple[int, int]]) -> float:
-    res = 0
-    for i, e in enumerate(grid):
-        if e == 0:
-            continue
-        cury, curx = divmod(i, width)
-        targety, targetx = gpos[e]
-        res += math.hypot(curx - targetx, cury - targety)
-    return res
+class Context:
+    """Tables of a goal shared by every heuristic call of a search
 
+    Heuristics take the grid and this context instead of recomputing the goal position of each tile, and the
+    distance tables are indexed by [tile][cell], the blank always costing 0. Build it through context() so that
+    it is computed once per (height, width, goal). The pattern databases and walking distance tables of the goal
+    are kept in it once built, so that holding the context keeps them loaded.
 
-def chebyshev(grid: List[int], width: int, gpos: List[Tuple[int, int]]) -> float:
-    res = 0
-    for i, e in enumerate(grid):
-        if e == 0:
-            continue
-        cury, curx = divmod(i, width)
-        targety, targetx = gpos[e]
-        res += max(abs(curx - targetx), abs(cury - targety))
-    return res
+    Attributes:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Tuple[int, ...]): Goal state
+        gpos (Tuple[Tuple[int, int], ...]): Goal row and column of each tile
+        manhattan (Tuple[Tuple[int, ...], ...]): Manhattan distance of each tile from each cell
+        euclidean (Tuple[Tuple[float, ...], ...]): Euclidean distance of each tile from each cell
+        chebyshev (Tuple[Tuple[int, ...], ...]): Chebyshev distance of each tile from each cell
+        misplaced (Tuple[Tuple[int, ...], ...]): Whether each tile is misplaced on each cell
+        lines (Tuple[Dict[Tuple[int, ...], int], ...]): Memoized linear conflict cost of each row, then of each
+            column, keyed by the tiles of the line
+        tables (Dict[str, Any]): Tables of the heuristics built on first use, by heuristic
+    """
+
+    def __init__(self, height: int, width: int, goal: Tuple[int, ...]):
+        size = height * width
+        gpos = [(-1, -1)] * size
+        for i, e in enumerate(goal):
+            gpos[e] = divmod(i, width)
+
+        self.height = height
+        self.width = width
+        self.goal = tuple(goal)
+        self.gpos = tuple(gpos)
+
+        cells = [divmod(i, width) for i in range(size)]
+        tables = {"manhattan": [], "euclidean": [], "chebyshev": [], "misplaced": []}
+        for e, (ty, tx) in enumerate(gpos):
+            offsets = [(abs(y - ty), abs(x - tx)) for y, x in cells] if e else [(0, 0)] * size
+            tables["manhattan"].append(tuple(dy + dx for dy, dx in offsets))
+            tables["euclidean"].append(tuple(math.hypot(dy, dx) for dy, dx in offsets))
+            tables["chebyshev"].append(tuple(max(dy, dx) for dy, dx in offsets))
+            tables["misplaced"].append(tuple(int(dy + dx > 0) for dy, dx in offsets))
+        self.manhattan = tuple(tables["manhattan"])
+        self.euclidean = tuple(tables["euclidean"])
+        self.chebyshev = tuple(tables["chebyshev"])
+        self.misplaced = tuple(tables["misplaced"])
+
+        self.lines = tuple({} for _ in range(height + width))
+        self.tables = {}
+
+
+@lru_cache(maxsize=16)
+def context(height: int, width: int, goal: Tuple[int, ...]) -> Context:
+    """Get the heuristic context of a goal, built once per (height, width, goal)
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Tuple[int, ...]): Goal state
+
+    Returns:
+        Context: Tables of the goal
+    """
+
+    return Context(height, width, tuple(goal))
+
+
+def manhattan(grid: List[int], ctx: Context) -> float:
+    dist = ctx.manhattan
+    return sum(dist[e][i] for i, e in enumerate(grid))
+
+
+def manhattan_delta(grid: List[int], ctx: Context, src: int, dst: int, key: Any) -> Tuple[float, Any]:
+    dist = ctx.manhattan[grid[src]]
+    return dist[dst] - dist[src], key
+
+
+def euclidean(grid: List[int], ctx: Context) -> float:
+    dist = ctx.euclidean
+    return sum(dist[e][i] for i, e in enumerate(grid))
+
+
+def euclidean_delta(grid: List[int], ctx: Context, src: int, dst: int, key: Any) -> Tuple[float, Any]:
+    dist = ctx.euclidean[grid[src]]
+    return dist[dst] - dist[src], key
 
 
-def misplaced(grid: List[int], width: int, gpos: List[Tuple[int, int]]) -> float:
-    return sum(divmod(i, width) != gpos[e] for i, e in enumerate(grid) if e)
+def chebyshev(grid: List[int], ctx: Context) -> float:
+    dist = ctx.chebyshev
+    return sum(dist[e][i] for i, e in enumerate(grid))
 
 
-def manhattan_with_lc(grid: List[int], width: int, gpos: List[Tuple[int, int]]) -> float:
+def chebyshev_delta(grid: List[int], ctx: Context, src: int, dst: int, key: Any) -> Tuple[float, Any]:
+    dist = ctx.chebyshev[grid[src]]
+    return dist[dst] - dist[src], key
+
+
+def misplaced(grid: List[int], ctx: Context) -> float:
+    dist = ctx.misplaced
+    return sum(dist[e][i] for i, e in enumerate(grid))
+
+
+def misplaced_delta(grid: List[int], ctx: Context, src: int, dst: int, key: Any) -> Tuple[float, Any]:
+    dist = ctx.misplaced[grid[src]]
+    return dist[dst] - dist[src], key
+
+
+def _line_cost(ctx: Context, index: int, line: Tuple[int, ...]) -> int:
+    """Get the linear conflict cost of a row (index < height) or a column (index - height)
+
+    The tiles of the line that belong to it in the goal must keep their goal order, so all of them but a longest
+    increasing subsequence have to leave the line and come back, costing 2 moves each. Costs are memoized by line.
+    """
+
+    memo = ctx.lines[index]
+    cost = memo.get(line)
+    if cost is None:
+        if len(memo) >= MAX_LINES:
+            # Bounds the memory of long-running processes, the hot lines come back quickly
+            memo.clear()
+        column = index >= ctx.height
+        own = index - ctx.height if column else index
+        # Goal position along the line of each tile of the line that belongs to it
+        order = [ctx.gpos[e][not column] for e in line if e and ctx.gpos[e][column] == own]
+        tails = []
+        for o in order:
+            i = bisect_left(tails, o)
+            tails[i : i + 1] = [o]
+        cost = memo[line] = 2 * (len(order) - len(tails))
+    return cost
+
+
+def manhattan_with_lc(grid: List[int], ctx: Context) -> float:
+    width, height = ctx.width, ctx.height
     lc = 0  # Linear conflics
+    for y in range(height):
+        lc += _line_cost(ctx, y, tuple(grid[y * width : (y + 1) * width]))
+    for x in range(width):
+        lc += _line_cost(ctx, height + x, tuple(grid[x::width]))
+    return manhattan(grid, ctx) + lc
+
+
+def manhattan_with_lc_delta(grid: List[int], ctx: Context, src: int, dst: int, key: Any) -> Tuple[float, Any]:
+    # Sliding a tile along a line keeps the order of that line, and the line it leaves or enters only changes
+    # when it is the goal line of the tile
+    e = grid[src]
+    width = ctx.width
+    sy, sx = divmod(src, width)
+    dy, dx = divmod(dst, width)
+    ty, tx = ctx.gpos[e]
+    lc = 0
+    if sx == dx:
+        if ty == sy or ty == dy:
+            line = grid[ty * width : (ty + 1) * width]
+            before = _line_cost(ctx, ty, tuple(line))
+            line[sx] = 0 if ty == sy else e
+            lc = _line_cost(ctx, ty, tuple(line)) - before
+    elif tx == sx or tx == dx:
+        line = grid[tx::width]
+        before = _line_cost(ctx, ctx.height + tx, tuple(line))
+        line[sy] = 0 if tx == sx else e
+        lc = _line_cost(ctx, ctx.height + tx, tuple(line)) - before
+    dist = ctx.manhattan[e]
+    return dist[dst] - dist[src] + lc, key
 
-    # Lines conflicts
-    for i, e in enumerate(grid):
-        # Current pos of e
-        y, x = divmod(i, width)
-        if e == 0:
-            continue
-        # Target pos of e
-        ty, tx = gpos[e]
-        # For each element before e in the same line
-        for k in range(x):
-            # Previous element current pos
-            p = grid[y * width + k]
-            if p == 0:
-                continue
-            # Previous element target pos
-            ky, kx = gpos[p]
-            # If same line and previous should be after e
-            if ky == ty == y and kx > tx:
-                lc += 1
-
-    # Columns conflicts
-    for i, e in enumerate(grid):
-        y, x = divmod(i, width)
-        if e == 0:
-            continue
-        ty, tx = gpos[e]
-        for k in range(y):
-            p = grid[k * width + x]
-            if p == 0:
-                continue
-            ky, kx = gpos[p]
-            if kx == tx == x and ky > ty:
-                lc += 1
-
-    return manhattan(grid, width, gpos) + 2 * lc
-
-
-def best(grid: List[int], width: int, gpos: List[Tuple[int, int]]) -> float:
+
+def best(grid: List[int], ctx: Context) -> float:
     return max(
-        heuristic(grid, width, gpos)
+        heuristic(grid, ctx)
         for heuristic in (euclidean, misplaced, chebyshev, manhattan_with_lc)
     )
 
 
-# TODO Pattern database
+def best_delta(grid: List[int], ctx: Context, src: int, dst: int, key: Any) -> Tuple[float, Any]:
+    # Manhattan with linear conflicts dominates every other heuristic of best on each tile
+    return manhattan_with_lc_delta(grid, ctx, src, dst, key)
+
+
+def _pattern_database(ctx: Context):
+    # Tables of each group, group of each tile and symmetric views, built once per context
+    tables = ctx.tables.get("pdb")
+    if tables is None:
+        tables = ctx.tables["pdb"] = _build_pattern_database(ctx.height, ctx.width, ctx.goal)
+    return tables
+
+
+def _build_pattern_database(height: int, width: int, goal: Tuple[int, ...]):
+    database = pattern_database.build(height, width, goal)
+    # Group of each tile with the weight of its cell in the index of the group
+    groups = [None] * len(goal)
+    for g, (tiles, weights, _, _) in enumerate(database):
+        for t, w in zip(tiles, weights):
+            groups[t] = g, w
+    # The image of a grid by a symmetry of the goal is as far from it, so with several symmetries the tables are
+    # looked up for each image: the tile named t in the image is the tile names[t] of the grid, on the image of its cell
+    views = []
+    symmetries = symmetry.group(height, width, goal)
+    for s in symmetries if len(symmetries) > 1 else ():
+        names = [0] * len(goal)
+        for t, name in enumerate(s.tiles):
+            names[name] = t
+        lookups = [(tuple(names[t] for t in tiles), weights, table, packed) for tiles, weights, table, packed in database]
+        view_groups = [None] * len(goal)
+        for g, (tiles, weights, _, _) in enumerate(lookups):
+            for t, w in zip(tiles, weights):
+                view_groups[t] = g, w
+        views.append((s.cells, lookups, view_groups))
+    return database, groups, views
+
+
+def _pdb_value(table, packed: bool, i: int) -> int:
+    return table[i >> 1] >> ((i & 1) << 2) & 15 if packed else table[i]
+
+
+def _pdb_views(grid: List[int], views) -> Tuple[Tuple[int, ...], Tuple[Tuple[int, ...], ...]]:
+    # Sum of the lookups of each image, and index of each group of each image in its table
+    pos = [0] * len(grid)
+    for i, t in enumerate(grid):
+        pos[t] = i
+    totals = []
+    indices = []
+    for cells, lookups, _ in views:
+        total = 0
+        view_indices = []
+        for tiles, weights, table, packed in lookups:
+            i = sum(cells[pos[t]] * w for t, w in zip(tiles, weights))
+            total += _pdb_value(table, packed, i)
+            view_indices.append(i)
+        totals.append(total)
+        indices.append(tuple(view_indices))
+    return tuple(totals), tuple(indices)
+
+
+def _pdb_indices(grid: List[int], database) -> Tuple[int, ...]:
+    # Index of each group in its table, from the cell of each tile
+    pos = [0] * len(grid)
+    for i, t in enumerate(grid):
+        pos[t] = i
+    return tuple(sum(pos[t] * w for t, w in zip(tiles, weights)) for tiles, weights, _, _ in database)
+
+
+def pdb(grid: List[int], ctx: Context) -> float:
+    database, _, views = _pattern_database(ctx)
+    if views:
+        return max(_pdb_views(grid, views)[0])
+
+    res = 0
+    for (_, _, table, packed), i in zip(database, _pdb_indices(grid, database)):
+        res += _pdb_value(table, packed, i)
+    return res
+
+
+def pdb_key(grid: List[int], ctx: Context) -> Tuple:
+    # Indices of the groups, or with symmetries the totals and indices of each image (see _pdb_views)
+    database, _, views = _pattern_database(ctx)
+    return _pdb_views(grid, views) if views else _pdb_indices(grid, database)
+
+
+def pdb_delta(grid: List[int], ctx: Context, src: int, dst: int, key: Any) -> Tuple[float, Any]:
+    database, groups, views = _pattern_database(ctx)
+    tile = grid[src]
+    if views:
+        # Only the group of the moved tile changes in each image, but the maximum may move to another image
+        totals, indices = key
+        new_totals = []
+        new_indices = []
+        for total, view_indices, (cells, lookups, view_groups) in zip(totals, indices, views):
+            g, weight = view_groups[tile]
+            _, _, table, packed = lookups[g]
+            i = view_indices[g]
+            new_i = i + (cells[dst] - cells[src]) * weight
+            new_totals.append(total + _pdb_value(table, packed, new_i) - _pdb_value(table, packed, i))
+            new_indices.append(view_indices[:g] + (new_i,) + view_indices[g + 1 :])
+        return max(new_totals) - max(totals), (tuple(new_totals), tuple(new_indices))
+
+    # Only the index of the group of the moved tile changes, by the weight of the tile
+    g, weight = groups[tile]
+    _, _, table, packed = database[g]
+    i = key[g]
+    new_i = i + (dst - src) * weight
+    return _pdb_value(table, packed, new_i) - _pdb_value(table, packed, i), key[:g] + (new_i,) + key[g + 1 :]
+
+
+def _walking_distance(ctx: Context):
+    # Row then column tables, with the goal line of each tile, the number of lines and the links of the states
+    tables = ctx.tables.get("walking_distance")
+    if tables is None:
+        height, width, goal = ctx.height, ctx.width, ctx.goal
+        rows, columns = wd.tables(height, width, goal)
+        tables = ctx.tables["walking_distance"] = tuple(
+            (table, wd.goal_lines(height, width, goal, column), count, *wd.graph(table, count))
+            for column, table, count in ((False, rows, height), (True, columns, width))
+        )
+    return tables
+
+
+def walking_distance(grid: List[int], ctx: Context) -> float:
+    res = 0
+    for column, (table, lines, count, _, _, _) in enumerate(_walking_distance(ctx)):
+        res += table[bytes(wd.key(grid, ctx.width, lines, count, column))]
+    return res
+
+
+def walking_distance_key(grid: List[int], ctx: Context) -> Tuple[int, int]:
+    # Numbers of the row and column abstract states
+    return tuple(
+        index[bytes(wd.key(grid, ctx.width, lines, count, column))]
+        for column, (_, lines, count, index, _, _) in enumerate(_walking_distance(ctx))
+    )
+
+
+def walking_distance_delta(grid: List[int], ctx: Context, src: int, dst: int, key: Tuple[int, int]) -> Tuple[float, Any]:
+    # Vertical moves only change the row state, horizontal moves the column one, following a single link
+    width = ctx.width
+    if src // width == dst // width:
+        _, lines, count, _, distances, links = _walking_distance(ctx)[1]
+        rows, state = key
+        new_state = links[(state * 2 + (src > dst)) * count + lines[grid[src]]]
+        return distances[new_state] - distances[state], (rows, new_state)
+    _, lines, count, _, distances, links = _walking_distance(ctx)[0]
+    state, columns = key
+    new_state = links[(state * 2 + (src > dst)) * count + lines[grid[src]]]
+    return distances[new_state] - distances[state], (new_state, columns)
+
+
+def key(heuristic: Callable, grid: List[int], ctx: Context) -> Any:
+    """Get the key of a grid carried by the search nodes for the incremental form of a heuristic (see delta)
+
+    Args:
+        heuristic (Callable): Heuristic function
+        grid (List[int]): State of the puzzle
+        ctx (Context): Tables of the goal
+
+    Returns:
+        Any: Key of the grid, None for heuristics without one
+    """
+
+    return KEYS[heuristic](grid, ctx) if heuristic in KEYS else None
+
+
+def towards(
+    heuristic: Callable, ctx: Context, target: Sequence[int]
+) -> Tuple[Callable, Context, Optional[Tuple[int, ...]], float]:
+    """Get how to estimate the distance to another target than the goal without building tables for it
+
+    The heuristics without tables get a context of the target, built outside of context() as it only serves one
+    search. Walking distance keeps the tables of the goal: renaming the tiles keeps the distances between grids as
+    long as the blank keeps its name, so each tile takes the name of the goal tile on its target cell. The renamed
+    target is the goal when both blanks share their cell, otherwise the tile on the goal cell of the blank is left
+    out of place, and the heuristic of a renamed grid minus the one of the renamed target is a lower bound of the
+    distance as the heuristic changes by at most 1 per move. Pattern databases do not, so they are replaced by
+    manhattan_with_lc.
+
+    Args:
+        heuristic (Callable): Heuristic function
+        ctx (Context): Tables of the goal
+        target (Sequence[int]): Target state
+
+    Returns:
+        Tuple[Callable, Context, Optional[Tuple[int, ...]], float]: Heuristic and context to evaluate the grids
+            with, new name of each tile (None to keep them) and heuristic of the renamed target to subtract
+    """
+
+    if heuristic is pdb:
+        heuristic = manhattan_with_lc
+    if heuristic is not walking_distance:
+        return heuristic, Context(ctx.height, ctx.width, tuple(target)), None, 0
+
+    names = [0] * len(target)
+    for t, e in zip(target, ctx.goal):
+        names[t] = e
+    # The blank keeps its name, and the tile on the goal cell of the blank takes the name left by the blank
+    names[target[ctx.goal.index(0)]] = ctx.goal[target.index(0)]
+    names[0] = 0
+    return heuristic, ctx, tuple(names), heuristic([names[t] for t in target], ctx)
+
+
+def delta(heuristic: Callable) -> Callable:
+    """Get the incremental form of a heuristic
+
+    The returned function takes (grid, ctx, src, dst, key) and gives the change of the heuristic when
+    the tile at src of grid slides into the blank at dst, with the key of the new grid. Keys hold what a heuristic
+    updates from a node to its children instead of scanning the grid, the search nodes carry them starting from
+    the key of the initial grid. Heuristics without a known incremental form are recomputed on the whole grid.
+
+    Args:
+        heuristic (Callable): Heuristic function
+
+    Returns:
+        Callable: Delta function of the heuristic
+    """
+
+    if heuristic in DELTAS:
+        return DELTAS[heuristic]
+
+    def recompute(grid, ctx, src, dst, key):
+        new_grid = list(grid)
+        new_grid[src], new_grid[dst] = new_grid[dst], new_grid[src]
+        return heuristic(new_grid, ctx) - heuristic(grid, ctx), key
+
+    return recompute
+
+
 DEFAULT = "manhattan_with_lc"
 NAMES = {
-    f.__name__: f for f in (manhattan, euclidean, misplaced, chebyshev, manhattan_with_lc, best)
+    f.__name__: f for f in (manhattan, euclidean, misplaced, chebyshev, manhattan_with_lc, best, pdb, walking_distance)
+}
+DELTAS = {
+    manhattan: manhattan_delta,
+    euclidean: euclidean_delta,
+    misplaced: misplaced_delta,
+    chebyshev: chebyshev_delta,
+    manhattan_with_lc: manhattan_with_lc_delta,
+    best: best_delta,
+    pdb: pdb_delta,
+    walking_distance: walking_distance_delta,
+}
+KEYS = {
+    pdb: pdb_key,
+    walking_distance: walking_distance_key,
 }
@@ -0,0 +1,98 @@
+from typing import Dict, List, Set, Tuple
+from functools import lru_cache
+
+
+MOVES = "v^><"
+DIRECTIONS = {"v": (1, 0), "^": (-1, 0), ">": (0, 1), "<": (0, -1)}
+
+
+def duplicates(max_length: int) -> Set[str]:
+    """Find the move sequences that can be replaced by a shorter or equivalent earlier one
+
+    Every sequence of at most max_length moves is played from the blank of an unbounded board, in order of length
+    then of MOVES. A sequence is a duplicate when an earlier sequence leaves the tiles and the blank in the same place
+    while only visiting cells it visits too, so that the earlier one is playable wherever the duplicate is.
+    Sequences containing a shorter duplicate are skipped, which keeps the returned set minimal.
+
+    Args:
+        max_length (int): Maximum length of the sequences
+
+    Returns:
+        Set[str]: Duplicate sequences
+    """
+
+    forbidden = set()
+    origin = (0, 0)
+    # Cells holding another tile than their own, with the blank position and the visited cells
+    level = [("", origin, {}, frozenset((origin,)))]
+    canonical: Dict[Tuple, List[frozenset]] = {(origin, frozenset()): [frozenset((origin,))]}
+
+    for _ in range(max_length):
+        upper = []
+        for sequence, blank, board, visited in level:
+            for move in MOVES:
+                new_sequence = sequence + move
+                if any(new_sequence[i:] in forbidden for i in range(1, len(new_sequence))):
+                    continue
+
+                dy, dx = DIRECTIONS[move]
+                new_blank = (blank[0] + dy, blank[1] + dx)
+                new_board = dict(board)
+                new_board[blank] = new_board.get(new_blank, new_blank)
+                new_board[new_blank] = origin
+                new_visited = visited | {new_blank}
+
+                key = new_blank, frozenset(item for item in new_board.items() if item[0] != item[1])
+                earlier = canonical.setdefault(key, [])
+                if any(cells <= new_visited for cells in earlier):
+                    forbidden.add(new_sequence)
+                    continue
+                earlier.append(new_visited)
+                upper.append((new_sequence, new_blank, new_board, new_visited))
+        level = upper
+
+    return forbidden
+
+
+@lru_cache(maxsize=None)
+def automaton(max_length: int = 2) -> Tuple[Dict[str, int], ...]:
+    """Build the finite state automaton rejecting the duplicate move sequences of at most max_length moves
+
+    The automaton is the Aho-Corasick matcher of duplicates(max_length): starting from state 0, the state after a
+    move is automaton[state][move], -1 meaning that the path ends with a duplicate sequence and can be pruned.
+    A max_length of 2 only rejects moves undoing the previous one.
+
+    Args:
+        max_length (int, optional): Maximum length of the duplicate sequences. Defaults to 2.
+
+    Returns:
+        Tuple[Dict[str, int], ...]: Transitions of each state
+    """
+
+    children = [{}]
+    rejected = [False]
+    for sequence in sorted(duplicates(max_length)):
+        state = 0
+        for move in sequence:
+            if move not in children[state]:
+                children[state][move] = len(children)
+                children.append({})
+                rejected.append(False)
+            state = children[state][move]
+        rejected[state] = True
+
+    transitions = [{} for _ in children]
+    fail = [0] * len(children)
+    queue = [0]
+    for state in queue:
+        for move in MOVES:
+            if move in children[state]:
+                child = children[state][move]
+                fail[child] = transitions[fail[state]][move] if state else 0
+                rejected[child] = rejected[child] or rejected[fail[child]]
+                transitions[state][move] = child
+                queue.append(child)
+            else:
+                transitions[state][move] = transitions[fail[state]][move] if state else 0
+
+    return tuple({move: -1 if rejected[n] else n for move, n in t.items()} for t in transitions)
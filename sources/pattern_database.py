@@ -0,0 +1,326 @@
+from typing import List, Optional, Sequence, Tuple, Union
+from math import perm
+import hashlib
+import mmap
+import os
+
+
+# Upper bounds for a single group, in abstract states (tiles + blank) and in table cells
+MAX_STATES = 6_000_000
+MAX_CELLS = 1 << 25
+
+# On-disk cache of the built tables, None disables it
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "n-puzzle")
+MAX_CACHE_SIZE = 512 << 20
+# Cache files removed by evict: pattern databases, walking distance tables and files left by interrupted writes
+EVICTABLE = (".pdb", ".wd", ".tmp")
+
+MAGIC = b"NPDB\x01"
+HEADER_SIZE = 8
+
+Table = Union[bytearray, memoryview]
+
+
+def neighbours(height: int, width: int) -> Tuple[Tuple[int, ...], ...]:
+    """Get the adjacent cells of each cell of the puzzle
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+
+    Returns:
+        Tuple[Tuple[int, ...], ...]: Indices adjacent to each cell index
+    """
+
+    adj = []
+    for i in range(height * width):
+        y, x = divmod(i, width)
+        adj.append(
+            tuple(
+                ny * width + nx
+                for ny, nx in ((y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1))
+                if 0 <= ny < height and 0 <= nx < width
+            )
+        )
+    return tuple(adj)
+
+
+def group_size(height: int, width: int) -> int:
+    """Get the largest pattern size that can be built within the memory and time bounds
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+
+    Returns:
+        int: Maximum number of tiles in a group
+    """
+
+    size = height * width
+    k = 1
+    while k + 1 < size and perm(size, k + 2) <= MAX_STATES and size ** (k + 2) <= MAX_CELLS:
+        k += 1
+    return k
+
+
+def partition(height: int, width: int, goal: Sequence[int], k: Optional[int] = None) -> List[Tuple[int, ...]]:
+    """Split the tiles in disjoint groups of neighbouring goal positions
+
+    Tiles are taken in reading order of their goal position so that each group covers a compact area
+    of the goal, and the groups are balanced (e.g. 5-5-5 for a 4x4 puzzle, 4-4 for a 3x3 one).
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Sequence[int]): Goal state
+        k (int, optional): Maximum number of tiles in a group. Defaults to group_size(height, width).
+
+    Returns:
+        List[Tuple[int, ...]]: Tiles of each group
+    """
+
+    if k is None:
+        k = group_size(height, width)
+
+    tiles = [e for e in goal if e]
+    count = -(-len(tiles) // k) if tiles else 0
+    groups = []
+    start = 0
+    for g in range(count):
+        end = start + (len(tiles) - start) // (count - g)
+        groups.append(tuple(tiles[start:end]))
+        start = end
+    return groups
+
+
+def build_group(height: int, width: int, goal: Sequence[int], tiles: Sequence[int]) -> bytearray:
+    """Build the additive pattern database of a group of tiles
+
+    The table is filled by a retrograde breadth-first search from the goal over the abstract states made of
+    the positions of the group tiles and of the blank. Moving the blank over a tile outside of the group is free,
+    so that the costs of disjoint groups can be summed while staying admissible.
+
+    The table is indexed by sum(position(tiles[i]) * size ** i) and holds the minimum number of moves of the
+    group tiles over every blank position, 255 for unreachable indices.
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Sequence[int]): Goal state
+        tiles (Sequence[int]): Tiles of the group
+
+    Returns:
+        bytearray: Pattern database of the group
+    """
+
+    size = height * width
+    adj = neighbours(height, width)
+    weights = [size ** (i + 1) for i in range(len(tiles))]
+
+    # Abstract states are encoded as blank + size * (table index)
+    start = goal.index(0) + sum(goal.index(t) * w for t, w in zip(tiles, weights))
+    seen = bytearray(size ** (len(tiles) + 1))
+    table = bytearray(b"\xff") * size ** len(tiles)
+
+    seen[start] = 1
+    layer = [start]
+    cost = 0
+    while layer:
+        upper = []
+        # Free moves of the blank are explored within the current layer
+        while layer:
+            state = layer.pop()
+            index = state // size
+            if table[index] == 255:
+                table[index] = cost
+            blank = state - index * size
+
+            occupied = {}
+            for w in weights:
+                index, p = divmod(index, size)
+                occupied[p] = w
+
+            for n in adj[blank]:
+                w = occupied.get(n)
+                if w is None:
+                    new_state = state + n - blank
+                    if not seen[new_state]:
+                        seen[new_state] = 1
+                        layer.append(new_state)
+                else:
+                    new_state = state + (n - blank) * (1 - w)
+                    if not seen[new_state]:
+                        upper.append(new_state)
+
+        for state in upper:
+            if not seen[state]:
+                seen[state] = 1
+                layer.append(state)
+        cost += 1
+
+    return table
+
+
+def cache_path(directory: str, height: int, width: int, goal: Sequence[int], tiles: Sequence[int]) -> str:
+    """Get the cache file of a group table
+
+    Args:
+        directory (str): Cache directory
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Sequence[int]): Goal state
+        tiles (Sequence[int]): Tiles of the group
+
+    Returns:
+        str: Path of the cache file
+    """
+
+    key = f"{height}x{width}:{','.join(map(str, goal))}:{','.join(map(str, tiles))}"
+    digest = hashlib.sha256(key.encode()).hexdigest()[:24]
+    return os.path.join(directory, f"{height}x{width}-{digest}.pdb")
+
+
+def save(path: str, table: bytearray) -> None:
+    """Write a group table to a cache file
+
+    Tables whose values all fit in 4 bits are stored as packed nibbles (low nibble first), other ones as bytes.
+    The file is written aside and renamed so that concurrent readers never see a partial table.
+
+    Args:
+        path (str): Path of the cache file
+        table (bytearray): Group table
+    """
+
+    values = table.translate(bytes(range(255)) + b"\0")
+    packed = max(values, default=0) < 16
+    if packed:
+        values += b"\0" * (len(values) & 1)
+        values = bytes(a | b << 4 for a, b in zip(values[::2], values[1::2]))
+
+    header = MAGIC + bytes((packed,)) + b"\0" * (HEADER_SIZE - len(MAGIC) - 1)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(values)
+    os.replace(tmp, path)
+
+
+def load(path: str) -> Optional[Tuple[memoryview, bool]]:
+    """Map a group table from a cache file
+
+    The file is memory-mapped read-only, so every process using the same table shares its pages.
+
+    Args:
+        path (str): Path of the cache file
+
+    Returns:
+        Optional[Tuple[memoryview, bool]]: Table and whether it is packed as nibbles, None if the file is missing or invalid
+    """
+
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(mapped) < HEADER_SIZE or mapped[: len(MAGIC)] != MAGIC:
+        mapped.close()
+        return None
+
+    # Keep recently used tables away from eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    return memoryview(mapped)[HEADER_SIZE:], bool(mapped[len(MAGIC)])
+
+
+def evict(directory: str, max_size: int = MAX_CACHE_SIZE, keep: Sequence[str] = ()) -> None:
+    """Remove the least recently used tables until the cache fits in max_size bytes
+
+    Every file of the directory counts in its size, but only the EVICTABLE ones are removed: the solution cache
+    (see solution_cache) may be open in other processes.
+
+    Args:
+        directory (str): Cache directory
+        max_size (int, optional): Maximum total size of the cache. Defaults to MAX_CACHE_SIZE.
+        keep (Sequence[str], optional): Paths that must not be removed. Defaults to ().
+    """
+
+    entries = []
+    total = 0
+    for entry in os.scandir(directory):
+        if entry.is_file():
+            stat = entry.stat()
+            total += stat.st_size
+            if entry.name.endswith(EVICTABLE):
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        if path in keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def build(
+    height: int,
+    width: int,
+    goal: Sequence[int],
+    groups: Optional[List[Tuple[int, ...]]] = None,
+    cache_dir: Optional[str] = "",
+) -> Tuple[Tuple[Tuple[int, ...], Tuple[int, ...], Table, bool], ...]:
+    """Build a disjoint pattern database for a goal, or load it from the cache
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Sequence[int]): Goal state
+        groups (List[Tuple[int, ...]], optional): Disjoint groups of tiles. Defaults to partition(height, width, goal).
+        cache_dir (str, optional): Cache directory, None to disable the cache. Defaults to CACHE_DIR.
+
+    Returns:
+        Tuple[Tuple[Tuple[int, ...], Tuple[int, ...], Table, bool], ...]:
+            Tiles, index weights, table and nibble packing of each group
+    """
+
+    if groups is None:
+        groups = partition(height, width, goal)
+    if cache_dir == "":
+        cache_dir = CACHE_DIR
+
+    size = height * width
+    database = []
+    paths = []
+    for tiles in groups:
+        tiles = tuple(tiles)
+        weights = tuple(size**i for i in range(len(tiles)))
+
+        cached = None
+        if cache_dir is not None:
+            path = cache_path(cache_dir, height, width, goal, tiles)
+            paths.append(path)
+            cached = load(path)
+            if cached is not None and len(cached[0]) != (size ** len(tiles) + cached[1]) >> cached[1]:
+                cached = None
+
+        if cached is None:
+            table = build_group(height, width, goal, tiles)
+            database.append((tiles, weights, table, False))
+            if cache_dir is not None:
+                try:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    save(path, table)
+                    evict(cache_dir, keep=paths)
+                except OSError:
+                    pass
+        else:
+            database.append((tiles, weights, *cached))
+
+    return tuple(database)
@@ -0,0 +1,172 @@
+from typing import Callable, Dict, List, Tuple
+from time import perf_counter
+
+
+class TimedDict(dict):
+    """Dictionary timing its lookups and insertions into a Profile, used in place of the seen dictionaries"""
+
+    def __init__(self, profile: "Profile", phase: str):
+        super().__init__()
+        self.profile = profile
+        self.phase = phase
+
+    def __contains__(self, key):
+        start = perf_counter()
+        result = super().__contains__(key)
+        self.profile.add(self.phase, perf_counter() - start)
+        return result
+
+    def __getitem__(self, key):
+        start = perf_counter()
+        result = super().__getitem__(key)
+        self.profile.add(self.phase, perf_counter() - start)
+        return result
+
+    def __setitem__(self, key, value):
+        start = perf_counter()
+        super().__setitem__(key, value)
+        self.profile.add(self.phase, perf_counter() - start)
+
+
+class Profile:
+    """Timers and counters of a search
+
+    Solvers taking a profile argument replace their heuristic, open list and seen dictionary by the timed and counted
+    versions given by this class once, before searching. Without a profile they run their usual code, so the
+    instrumentation costs nothing when disabled. Timed calls include the overhead of perf_counter.
+    """
+
+    def __init__(self, interval: int = 1024):
+        """
+        Args:
+            interval (int, optional): Number of pops between two samples of the open list size. Defaults to 1024.
+        """
+
+        self.interval = interval
+        self.timers: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.open_sizes: List[Tuple[int, int]] = []
+        self.start = perf_counter()
+
+    def add(self, phase: str, elapsed: float) -> None:
+        """Add time to a phase
+
+        Args:
+            phase (str): Name of the phase
+            elapsed (float): Time in seconds
+        """
+
+        self.timers[phase] = self.timers.get(phase, 0) + elapsed
+
+    def count(self, counter: str, value: int = 1) -> None:
+        """Increment a counter
+
+        Args:
+            counter (str): Name of the counter
+            value (int, optional): Increment. Defaults to 1.
+        """
+
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def phase(self, phase: str) -> None:
+        """End the current phase, the time elapsed since the previous call is added to it
+
+        Args:
+            phase (str): Name of the phase that just ended
+        """
+
+        now = perf_counter()
+        self.add(phase, now - self.start)
+        self.start = now
+
+    def timed(self, phase: str, function: Callable) -> Callable:
+        """Wrap a function to count its calls and add their time to a phase
+
+        Args:
+            phase (str): Name of the phase, also the name of the call counter
+            function (Callable): Function to wrap
+
+        Returns:
+            Callable: Wrapped function
+        """
+
+        def wrapper(*args):
+            start = perf_counter()
+            result = function(*args)
+            self.timers[phase] = self.timers.get(phase, 0) + perf_counter() - start
+            self.counters[phase] = self.counters.get(phase, 0) + 1
+            return result
+
+        return wrapper
+
+    def counted(self, counter: str, generator: Callable) -> Callable:
+        """Wrap a generator function to count the items it yields
+
+        Args:
+            counter (str): Name of the counter
+            generator (Callable): Generator function to wrap
+
+        Returns:
+            Callable: Wrapped generator function
+        """
+
+        def wrapper(*args):
+            for item in generator(*args):
+                self.counters[counter] = self.counters.get(counter, 0) + 1
+                yield item
+
+        return wrapper
+
+    def open_list(self, container, push: Callable, pop: Callable) -> Tuple[Callable, Callable]:
+        """Wrap the push and pop functions of an open list, sampling its size every interval pops
+
+        Args:
+            container (Sized): Open list
+            push (Callable): Push function
+            pop (Callable): Pop function
+
+        Returns:
+            Tuple[Callable, Callable]: Timed push and pop functions
+        """
+
+        push = self.timed("push", push)
+        timed_pop = self.timed("pop", pop)
+
+        def sampled_pop():
+            pops = self.counters.get("pop", 0)
+            if not pops % self.interval:
+                self.open_sizes.append((pops, len(container)))
+            return timed_pop()
+
+        return push, sampled_pop
+
+    def search(self, expansions: int, closed: int, solved: bool) -> None:
+        """End the search phase of an A* based solver and derive its counters
+
+        Requires the solver to use the timed heuristic and open list, the TimedDict and the counted "children" moves.
+        The time of the search spent outside of the timed calls (loops, tuples, packing) goes to the "expand" phase.
+
+        Args:
+            expansions (int): Number of expanded states
+            closed (int): Number of distinct expanded states
+            solved (bool): Whether the goal was popped
+        """
+
+        self.phase("search")
+        counters = self.counters
+        pushes = counters.get("push", 0)
+        counters["expansions"] = expansions
+        counters["generated"] = pushes
+        counters["reopenings"] = expansions - closed
+        # Children skipped as already seen at a lower depth, and stale entries popped
+        counters["duplicates_pruned"] = counters.get("children", 0) - pushes + counters.get("pop", 0) - expansions - solved
+        self.timers["expand"] = self.timers["search"] - sum(self.timers.get(p, 0) for p in ("heuristic", "push", "pop", "seen"))
+
+    def report(self) -> Dict:
+        """Get the structured profile
+
+        Returns:
+            Dict: Timers in seconds, counters and (pops, size) samples of the open list
+        """
+
+        return {"timers": dict(self.timers), "counters": dict(self.counters), "open_sizes": list(self.open_sizes)}
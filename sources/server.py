@@ -0,0 +1,465 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import OrderedDict
+from bisect import bisect_left
+from time import perf_counter
+import multiprocessing
+import socketserver
+import threading
+import itertools
+import signal
+import queue
+import json
+import stat
+import math
+import os
+from . import generator, heuristics, solution_cache, solver
+
+
+# Upper bounds of the latency histogram buckets, in seconds
+BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 30, 60)
+
+# Solvers kept warm by each worker, by goal, algorithm and heuristic
+MAX_SOLVERS = 16
+
+# Seconds between two checks of the deadline and cancellation of a running job
+POLL_INTERVAL = 0.01
+
+
+class Histogram:
+    """Latency histogram with fixed buckets"""
+
+    def __init__(self, bounds: Sequence[float] = BUCKETS):
+        """
+        Args:
+            bounds (Sequence[float], optional): Increasing upper bounds of the buckets, in seconds. Defaults to BUCKETS.
+        """
+
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a latency
+
+        Args:
+            value (float): Latency in seconds
+        """
+
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def report(self) -> Dict:
+        """Get the histogram
+
+        Returns:
+            Dict: Count of each bucket by upper bound ("inf" for the last one), total count and sum in seconds
+        """
+
+        bounds = [str(bound) for bound in self.bounds] + ["inf"]
+        return {"buckets": dict(zip(bounds, self.counts)), "count": self.count, "sum": self.sum}
+
+
+class Job:
+    """Solve request waiting in the queue or running on a worker
+
+    Attributes:
+        id (str): Identifier, given by the client or generated
+        request (Dict): Normalized request (see parse)
+        timeout (float): Seconds allowed to the solve, once on a worker
+        created (float): Time of the submission
+        started (Optional[float]): Time of the dispatch to a worker
+        cancelled (bool): Whether the job was cancelled
+        record (Optional[Dict]): Result, with the status and either the solution or the error
+        done (threading.Event): Set once the record is available
+    """
+
+    def __init__(self, job_id: str, request: Dict, timeout: float):
+        self.id = job_id
+        self.request = request
+        self.timeout = timeout
+        self.created = perf_counter()
+        self.started: Optional[float] = None
+        self.cancelled = False
+        self.record: Optional[Dict] = None
+        self.done = threading.Event()
+
+
+def _integer(value) -> bool:
+    # JSON booleans are Python ints, and floats such as 0.0 compare equal to the tiles
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _grid(value, height: Optional[int], width: Optional[int]) -> Tuple[int, int, List[int]]:
+    """Read a grid given as a list of rows, or as a flat list with its dimensions"""
+
+    if not isinstance(value, list) or not value:
+        raise ValueError("Grids must be non-empty lists")
+    if isinstance(value[0], list):
+        height, width = len(value), len(value[0])
+        if any(not isinstance(row, list) or len(row) != width for row in value):
+            raise ValueError("Rows must have the same length")
+        if not width:
+            raise ValueError("Rows must not be empty")
+        value = [e for row in value for e in row]
+    elif height is None or width is None:
+        raise ValueError("Flat grids need a height and a width")
+    elif not _integer(height) or not _integer(width) or height <= 0 or width <= 0:
+        raise ValueError("Dimensions must be positive integers")
+    if not all(_integer(e) for e in value):
+        raise ValueError("Tiles must be integers")
+    if len(value) != height * width or sorted(value) != list(range(height * width)):
+        raise ValueError(f"Invalid {height}x{width} grid")
+    return height, width, value
+
+
+def parse(body: Dict) -> Dict:
+    """Normalize a solve request
+
+    Args:
+        body (Dict): Request, with the puzzle as a list of rows (or flat with "height" and "width", or "size" for a
+            square), and optional "goal" (same format, defaults to the spiral goal), "algorithm", "heuristic", "id"
+            and "timeout" in seconds
+
+    Raises:
+        ValueError: If the request is invalid
+
+    Returns:
+        Dict: Height, width, puzzle and goal tuples, algorithm and heuristic names, id and timeout (None if missing)
+    """
+
+    if not isinstance(body, dict) or "puzzle" not in body:
+        raise ValueError("Requests must be objects with a puzzle")
+
+    size = body.get("size")
+    height, width, puzzle = _grid(body["puzzle"], body.get("height", size), body.get("width", size))
+    if body.get("goal") is None:
+        goal = generator.make_goal(height, width)
+    else:
+        goal_height, goal_width, goal = _grid(body["goal"], height, width)
+        if (goal_height, goal_width) != (height, width):
+            raise ValueError("Invalid goal dimensions")
+
+    algorithm = body.get("algorithm", solver.DEFAULT)
+    heuristic = body.get("heuristic", heuristics.DEFAULT)
+    if not isinstance(algorithm, str) or not isinstance(heuristic, str):
+        raise ValueError("Algorithms and heuristics must be given by name")
+    if algorithm not in solver.NAMES:
+        raise ValueError(f"Unknown algorithm {algorithm!r}")
+    if heuristic not in heuristics.NAMES:
+        raise ValueError(f"Unknown heuristic {heuristic!r}")
+
+    timeout = body.get("timeout")
+    if timeout is not None and (
+        not isinstance(timeout, (int, float)) or isinstance(timeout, bool) or not math.isfinite(timeout) or timeout <= 0
+    ):
+        raise ValueError("Timeouts must be positive numbers of seconds")
+
+    return {
+        "id": None if body.get("id") is None else str(body["id"]),
+        "height": height,
+        "width": width,
+        "puzzle": tuple(puzzle),
+        "goal": tuple(goal),
+        "algorithm": algorithm,
+        "heuristic": heuristic,
+        "timeout": timeout,
+    }
+
+
+def _worker(connection, options: Dict, cache_path: Optional[str]) -> None:
+    """Solve the requests received from a connection until it closes, keeping the solvers warm
+
+    Args:
+        connection (Connection): Pipe to the server
+        options (Dict): Solver options (see solver.run)
+        cache_path (Optional[str]): Solution cache file, None to disable the cache
+    """
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    cache = None if cache_path is None else solution_cache.SolutionCache(cache_path)
+    solvers: "OrderedDict[Tuple, solver.Solver]" = OrderedDict()
+    while True:
+        try:
+            request = connection.recv()
+        except (EOFError, OSError):
+            break
+
+        record = {}
+        try:
+            key = (request["height"], request["width"], request["goal"], request["algorithm"], request["heuristic"])
+            instance = solvers.get(key)
+            if instance is None:
+                instance = solvers[key] = solver.Solver(*key, cache=cache, **options)
+                if len(solvers) > MAX_SOLVERS:
+                    solvers.popitem(last=False)
+            solvers.move_to_end(key)
+
+            start = perf_counter()
+            moves, time_complexity, space_complexity = instance.solve(request["puzzle"])
+            record.update(moves=moves, time=perf_counter() - start, nodes=time_complexity, peak_states=space_complexity)
+        except Exception as ex:
+            record["error"] = f"{ex.__class__.__name__}: {ex}"
+        connection.send(record)
+
+
+class Worker:
+    """Worker process of the pool, restarted when one of its jobs times out or is cancelled"""
+
+    def __init__(self, options: Dict, cache_path: Optional[str]):
+        self.options = options
+        self.cache_path = cache_path
+        self.start()
+
+    def start(self) -> None:
+        """Start the process, with empty solvers"""
+
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker, args=(child, self.options, self.cache_path), daemon=True)
+        self.process.start()
+        child.close()
+
+    def stop(self) -> None:
+        """Kill the process, stopping its search if any"""
+
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+    def restart(self) -> None:
+        """Kill the process and start a new one"""
+
+        self.stop()
+        self.start()
+
+
+class Pool:
+    """Queue of solve requests dispatched to warm worker processes
+
+    Each worker has a dispatcher thread taking the jobs from the queue one at a time. A job running past its timeout,
+    or cancelled while running, has its worker killed and restarted, which is the only way to stop a search from the
+    outside. Its warm solvers are then lost, other workers keep theirs.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: float = 30, cache_path: Optional[str] = None, **options):
+        """
+        Args:
+            workers (Optional[int], optional): Number of worker processes. Defaults to the number of CPUs.
+            timeout (float, optional): Default and longest time limit of a solve in seconds. Defaults to 30.
+            cache_path (Optional[str], optional): Solution cache file shared by the workers. Defaults to None (disabled).
+            **options: Solver options (see solver.run), workers run parallel_id_astar on a single job
+        """
+
+        options["jobs"] = 1
+        self.timeout = timeout
+        self.queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self.jobs: Dict[str, Job] = {}
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.counters = {"ok": 0, "error": 0, "timeout": 0, "cancelled": 0}
+        self.busy = 0
+        self.latency = {"queue": Histogram(), "solve": Histogram(), "total": Histogram()}
+
+        self.workers = [Worker(options, cache_path) for _ in range(workers or os.cpu_count() or 1)]
+        self.threads = [threading.Thread(target=self._dispatch, args=(worker,), daemon=True) for worker in self.workers]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, request: Dict) -> Job:
+        """Queue a solve request
+
+        Args:
+            request (Dict): Normalized request (see parse)
+
+        Raises:
+            ValueError: If a job with the same id is already queued or running
+
+        Returns:
+            Job: Queued job, whose done event is set once solved
+        """
+
+        with self.lock:
+            job_id = request["id"] or f"job-{next(self.ids)}"
+            if job_id in self.jobs:
+                raise ValueError(f"Job {job_id!r} is already queued or running")
+            # Requests may shorten the time limit of the server, not extend it
+            job = self.jobs[job_id] = Job(job_id, request, min(request["timeout"] or self.timeout, self.timeout))
+        self.queue.put(job)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job
+
+        Args:
+            job_id (str): Identifier of the job
+
+        Returns:
+            bool: Whether the job was found
+        """
+
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is not None:
+                job.cancelled = True
+        return job is not None
+
+    def _finish(self, job: Job, status: str, record: Dict) -> None:
+        """Record the result of a job and wake up its client"""
+
+        now = perf_counter()
+        with self.lock:
+            self.counters[status] += 1
+            if job.started is not None:
+                self.latency["solve"].observe(now - job.started)
+            self.latency["total"].observe(now - job.created)
+            del self.jobs[job.id]
+        job.record = {"id": job.id, "status": status, **record}
+        job.done.set()
+
+    def _dispatch(self, worker: Worker) -> None:
+        """Run the jobs of the queue on a worker, until None is taken from the queue"""
+
+        while True:
+            job = self.queue.get()
+            if job is None:
+                break
+            if job.cancelled:
+                self._finish(job, "cancelled", {"error": "Cancelled while queued"})
+                continue
+
+            job.started = perf_counter()
+            with self.lock:
+                self.latency["queue"].observe(job.started - job.created)
+                self.busy += 1
+
+            status, record = "ok", None
+            try:
+                worker.connection.send(job.request)
+                deadline = job.started + job.timeout
+                while record is None:
+                    if worker.connection.poll(POLL_INTERVAL):
+                        record = worker.connection.recv()
+                        if "error" in record:
+                            status = "error"
+                    elif job.cancelled:
+                        worker.restart()
+                        status, record = "cancelled", {"error": "Cancelled while running"}
+                    elif perf_counter() > deadline:
+                        worker.restart()
+                        status, record = "timeout", {"error": f"No solution within {job.timeout}s"}
+            except (EOFError, OSError) as ex:
+                worker.restart()
+                status, record = "error", {"error": f"Worker failed: {ex.__class__.__name__}"}
+
+            with self.lock:
+                self.busy -= 1
+            self._finish(job, status, record)
+
+    def stats(self) -> Dict:
+        """Get the state of the pool
+
+        Returns:
+            Dict: Queue depth, busy and total workers, count of each status and queue, solve and total latency histograms
+        """
+
+        with self.lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "busy_workers": self.busy,
+                "workers": len(self.workers),
+                **self.counters,
+                "latency": {name: histogram.report() for name, histogram in self.latency.items()},
+            }
+
+    def close(self) -> None:
+        """Stop the dispatchers and the workers, jobs still queued are left unanswered"""
+
+        for _ in self.threads:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.stop()
+
+
+class Handler(BaseHTTPRequestHandler):
+    """JSON API of the server
+
+    Routes:
+        POST /solve: Solve the puzzle of the request (see parse), answering once done, 200 if solved, 400 for invalid
+            requests, 409 if cancelled, 422 if the solver failed (e.g. unsolvable puzzle) and 504 on timeout
+        POST /cancel/<id>: Cancel a queued or running job, 404 if unknown
+        GET /stats: State of the pool (see Pool.stats)
+    """
+
+    STATUSES = {"ok": 200, "error": 422, "cancelled": 409, "timeout": 504}
+
+    def _send(self, code: int, body: Dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            self._send(200, self.server.pool.stats())
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        pool = self.server.pool
+        if self.path.startswith("/cancel/"):
+            job_id = self.path[len("/cancel/") :]
+            found = pool.cancel(job_id)
+            self._send(200 if found else 404, {"id": job_id, "cancelled": found})
+            return
+        if self.path != "/solve":
+            self._send(404, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = pool.submit(parse(json.loads(self.rfile.read(length) or b"null")))
+        except (TypeError, ValueError) as ex:
+            self._send(400, {"error": str(ex)})
+            return
+        job.done.wait()
+        self._send(self.STATUSES[job.record["status"]], job.record)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix socket, a thread per connection"""
+
+    daemon_threads = True
+
+
+def serve(address: str, pool: Pool) -> socketserver.BaseServer:
+    """Create the HTTP server of a pool
+
+    Args:
+        address (str): Unix socket path (containing a slash) or localhost port, as PORT or HOST:PORT
+        pool (Pool): Pool solving the requests
+
+    Returns:
+        socketserver.BaseServer: Server, to run with serve_forever
+    """
+
+    if "/" in address:
+        if os.path.exists(address) and stat.S_ISSOCK(os.stat(address).st_mode):
+            os.unlink(address)
+        server = UnixHTTPServer(address, Handler)
+    else:
+        host, _, port = address.rpartition(":")
+        server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), Handler)
+        server.daemon_threads = True
+    server.pool = pool
+    return server
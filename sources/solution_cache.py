@@ -0,0 +1,168 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+import sqlite3
+import struct
+import os
+from . import pattern_database, utils
+
+
+# Algorithms always returning a shortest path, with any of the (admissible) heuristics
+OPTIMAL = {"astar", "batch_astar", "uniform_cost", "id_astar", "id_astar_rec", "parallel_id_astar", "bd_mm"}
+
+# Solutions of each key: (algorithm, heuristic, optimal, moves)
+Entry = Tuple[str, str, bool, str]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    key BLOB NOT NULL,
+    algorithm TEXT NOT NULL,
+    heuristic TEXT NOT NULL,
+    optimal INTEGER NOT NULL,
+    moves TEXT NOT NULL,
+    PRIMARY KEY (key, algorithm, heuristic)
+)
+"""
+
+
+def key(height: int, width: int, puzzle: Sequence[int], goal: Sequence[int]) -> bytes:
+    """Get the cache key of a puzzle, its dimensions followed by the packed puzzle and goal
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        puzzle (Sequence[int]): Initial state
+        goal (Sequence[int]): Goal state
+
+    Returns:
+        bytes: Cache key
+    """
+
+    size = height * width
+    bits = utils.cell_bits(size)
+    length = (size * bits + 7) // 8
+    return (
+        struct.pack(">HH", height, width)
+        + utils.pack(puzzle, bits).to_bytes(length, "big")
+        + utils.pack(goal, bits).to_bytes(length, "big")
+    )
+
+
+def default_path() -> Optional[str]:
+    """Get the default cache file, in the pattern database cache directory
+
+    Returns:
+        Optional[str]: Path of the cache file, None if the cache directory is disabled
+    """
+
+    if pattern_database.CACHE_DIR is None:
+        return None
+    return os.path.join(pattern_database.CACHE_DIR, "solutions.sqlite3")
+
+
+class SolutionCache:
+    """Solutions of previously solved puzzles, in memory and in an SQLite file
+
+    Each solution records the algorithm and heuristic that found it and whether it is optimal. An optimal solution
+    answers any request, other solutions only answer requests with the same algorithm and heuristic, so that asking
+    for an optimal algorithm never gets a suboptimal path. The most recently used keys are kept in memory.
+    """
+
+    def __init__(self, path: Optional[str] = "", capacity: int = 4096):
+        """
+        Args:
+            path (Optional[str], optional): SQLite file, None to keep the cache in memory only. Defaults to default_path().
+            capacity (int, optional): Number of keys kept in memory. Defaults to 4096.
+        """
+
+        if path == "":
+            path = default_path()
+
+        self.capacity = capacity
+        self.entries: "OrderedDict[bytes, List[Entry]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.db = None
+        if path is not None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.db = sqlite3.connect(path, timeout=30)
+            self.db.execute(SCHEMA)
+            self.db.commit()
+
+    def _load(self, cache_key: bytes) -> List[Entry]:
+        """Get the solutions of a key, from memory or from the file"""
+
+        entries = self.entries.get(cache_key)
+        if entries is None:
+            entries = []
+            if self.db is not None:
+                rows = self.db.execute(
+                    "SELECT algorithm, heuristic, optimal, moves FROM solutions WHERE key = ?", (cache_key,)
+                )
+                entries = [(algorithm, heuristic, bool(optimal), moves) for algorithm, heuristic, optimal, moves in rows]
+            self.entries[cache_key] = entries
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+        self.entries.move_to_end(cache_key)
+        return entries
+
+    def get(self, cache_key: bytes, algorithm: str, heuristic: str, optimal: bool) -> Optional[str]:
+        """Find a solution answering a request
+
+        Args:
+            cache_key (bytes): Key of the puzzle (see key)
+            algorithm (str): Name of the requested algorithm
+            heuristic (str): Name of the requested heuristic
+            optimal (bool): Whether the requested algorithm is optimal
+
+        Returns:
+            Optional[str]: Shortest matching solution, None if there is none
+        """
+
+        matches = [
+            moves
+            for entry_algorithm, entry_heuristic, entry_optimal, moves in self._load(cache_key)
+            if entry_optimal or (not optimal and (entry_algorithm, entry_heuristic) == (algorithm, heuristic))
+        ]
+        if not matches:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return min(matches, key=len)
+
+    def put(self, cache_key: bytes, algorithm: str, heuristic: str, optimal: bool, moves: str) -> None:
+        """Store a solution
+
+        Args:
+            cache_key (bytes): Key of the puzzle (see key)
+            algorithm (str): Name of the algorithm that found it
+            heuristic (str): Name of the heuristic that found it
+            optimal (bool): Whether the solution is optimal
+            moves (str): Sequence of moves (^v><)
+        """
+
+        entries = [entry for entry in self._load(cache_key) if entry[:2] != (algorithm, heuristic)]
+        entries.append((algorithm, heuristic, optimal, moves))
+        self.entries[cache_key] = entries
+        if self.db is not None:
+            self.db.execute(
+                "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?)", (cache_key, algorithm, heuristic, optimal, moves)
+            )
+            self.db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hits and misses of the cache
+
+        Returns:
+            Dict[str, int]: Number of hits and misses
+        """
+
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """Close the cache file"""
+
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -1,9 +1,76 @@
+from functools import partial
 from collections import deque
+from array import array
+import multiprocessing
+import inspect
 import heapq
-from . import utils
+import signal
+import math
+import time
+from . import generator, heuristics, move_pruning, profiling, solution_cache, symmetry, utils, vectorized
+from .bucket_queue import BucketQueue
 
 
-def astar(base_grid, height, width, goal, heuristic, use_g=True, use_h=True):
+# Rounding error tolerated on the f costs of the IDA* searches, whose float heuristics are summed move by move
+EPSILON = 1e-9
+
+
+def open_list(root, buckets=False):
+    """
+    Create the open list of an A* based search.
+
+    Entries are tuples starting with their f and h costs. Bucket queues are only used for integer costs,
+    heuristics such as euclidean fall back to a binary heap.
+
+    Args:
+        root (Tuple): Entry of the initial state
+        buckets (bool, optional): Use a BucketQueue instead of a binary heap. Defaults to False.
+
+    Returns:
+        Tuple[Sized, Function, Function]: The open list with its push and pop functions.
+    """
+
+    if buckets and isinstance(root[0], int) and isinstance(root[1], int):
+        queue = BucketQueue()
+        queue.push(root)
+        return queue, queue.push, queue.pop
+
+    heap = [root]
+    return heap, partial(heapq.heappush, heap), partial(heapq.heappop, heap)
+
+
+def finish(search):
+    """
+    Run a stepped search to its end (see steps).
+
+    Args:
+        search (Generator): Stepped search.
+
+    Returns:
+        Any: The result of the search.
+    """
+
+    try:
+        while True:
+            next(search)
+    except StopIteration as stop:
+        return stop.value
+
+
+def _shifted(search, time_complexity, space_complexity):
+    """Run a stepped search as part of another one, adding the counters of the outer search to its pauses"""
+
+    while True:
+        try:
+            time, space = next(search)
+        except StopIteration as stop:
+            return stop.value
+        yield time_complexity + time, max(space_complexity, space)
+
+
+def astar(
+    base_grid, height, width, goal, heuristic, use_g=True, use_h=True, buckets=False, profile=None, max_memory=None, ctx=None
+):
     """
     Get the shortest path from an initial state to a goal state using A* alogrithm
 
@@ -27,6 +94,13 @@ def astar(base_grid, height, width, goal, heuristic, use_g=True, use_h=True):
         heuristic (Function): Heuristic function to use
         use_g (bool, optional): Toggle g cost (length of the current path). Defaults to True.
         use_h (bool, optional): Toggle h cost (heuristic of the current grid). Defaults to True.
+        buckets (bool, optional): Use a bucket queue as open list for integer heuristics. Defaults to False.
+        profile (profiling.Profile, optional): Collect timers and counters of the search, up to the id_astar fallback
+            of max_memory whose time and expansions go to the "fallback" timer and counter. Defaults to None.
+        max_memory (int, optional): Memory budget of the process in bytes, checked every 4096 states. Once exceeded,
+            the open and closed lists are dropped and the search goes on with id_astar, starting from the lowest f cost
+            of the open list. Defaults to None (unbounded).
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
 
     Returns:
         Tuple[str, int, int]:
@@ -35,55 +109,115 @@ def astar(base_grid, height, width, goal, heuristic, use_g=True, use_h=True):
             - Space complexity (int): The maximum number of states held in memory at any one time.
     """
 
+    return finish(
+        _astar_steps(base_grid, height, width, goal, heuristic, use_g, use_h, buckets, profile, max_memory, ctx=ctx)
+    )
+
+
+def _astar_steps(
+    base_grid, height, width, goal, heuristic, use_g=True, use_h=True, buckets=False, profile=None, max_memory=None,
+    ctx=None, slice_size=None
+):
+    """Stepped form of astar, pausing every slice_size states (see steps)"""
+
     space_complexity = 1
     time_complexity = 0
+    pause = slice_size or math.inf
     best = ""
 
-    gpos = [-1] * (height * width)
-    for i, e in enumerate(goal):
-        gpos[e] = divmod(i, width)
-    gpos = tuple(gpos)
+    if ctx is None:
+        ctx = heuristics.context(height, width, tuple(goal))
+
+    delta = heuristics.delta(heuristic)
+
+    # States are packed into integers, see utils.pack
+    size = height * width
+    bits = utils.cell_bits(size)
+    goal_state = utils.pack(goal, bits)
 
     start = base_grid.index(0)
     y, x = divmod(start, width)
 
-    heap = [(0, y, x, base_grid, str())]
+    evaluate = heuristic
+    children = utils.moves
     seen = {}
+    # Instrumented functions are swapped in once, the search loop is the same with or without profile. The heuristic
+    # itself is kept for its key and the id_astar fallback, which look it up in heuristics.KEYS and DELTAS
+    if profile is not None:
+        profile.phase("setup")
+        evaluate = profile.timed("heuristic", heuristic)
+        delta = profile.timed("heuristic", delta)
+        children = profile.counted("children", children)
+        seen = profiling.TimedDict(profile, "seen")
+
+    h = evaluate(base_grid, ctx) if use_h else 0
+    key = heuristics.key(heuristic, base_grid, ctx) if use_h else None
+    # Nodes only keep their parent and last move, paths are rebuilt with utils.trace
+    parents = array("l", [0])
+    moves = bytearray(1)
+
+    heap, push, pop = open_list((h, h, y, x, utils.pack(base_grid, bits), 0, 0, key), buckets)
+    if profile is not None:
+        push, pop = profile.open_list(heap, push, pop)
 
     while heap:
-        h, y, x, grid, path = heapq.heappop(heap)
-
-        depth = len(path)
+        f, h, y, x, state, node, depth, key = pop()
 
-        if grid == goal:
-            best = path
+        if state == goal_state:
+            best = utils.trace(parents, moves, node)
             break
 
-        if grid in seen and seen[grid] < depth:
+        if state in seen and seen[state] < depth:
             continue
 
-        seen[grid] = depth
+        seen[state] = depth
 
         time_complexity += 1
         space_complexity = max(space_complexity, len(heap) + len(seen))
-
-        for ny, nx, s in utils.moves(y, x, height, width, path[-1] if path else ""):
-            new_grid = list(grid)
-            # Make the move
-            new_grid[ny * width + nx], new_grid[y * width + x] = (
-                new_grid[y * width + x],
-                new_grid[ny * width + nx],
+        if time_complexity >= pause:
+            pause += slice_size
+            yield time_complexity, space_complexity
+
+        if not time_complexity & 4095 and max_memory is not None and utils.memory_usage() > max_memory:
+            # The popped f cost is the lowest of the open list, a lower bound of the solution length for A*
+            if profile is not None:
+                profile.search(time_complexity, len(seen), False)
+            heap = seen = parents = moves = push = pop = None
+            path, time, space = yield from _shifted(
+                _id_astar_steps(
+                    base_grid, height, width, goal, heuristic, min_bound=f if use_g and use_h else 0, ctx=ctx,
+                    slice_size=slice_size,
+                ),
+                time_complexity,
+                space_complexity,
             )
-            new_grid = tuple(new_grid)
-            if new_grid not in seen or depth <= seen[new_grid]:
+            if profile is not None:
+                profile.phase("fallback")
+                profile.count("fallback_expansions", time)
+            return path, time_complexity + time, max(space_complexity, space)
+
+        grid = utils.unpack(state, size, bits)
+        blank = y * width + x
+        for ny, nx, s in children(y, x, height, width, chr(moves[node]) if node else ""):
+            cell = ny * width + nx
+            # Make the move
+            tile = grid[cell]
+            new_state = state + (tile << blank * bits) - (tile << cell * bits)
+            if new_state not in seen or depth <= seen[new_state]:
                 g_cost = depth if use_g else 0
-                h_cost = heuristic(new_grid, width, gpos) if use_h else 0
-                heapq.heappush(heap, (h_cost + g_cost, ny, nx, new_grid, path + s))
+                h_delta, new_key = delta(grid, ctx, cell, blank, key) if use_h else (0, None)
+                h_cost = h + h_delta
+                parents.append(node)
+                moves.append(ord(s))
+                push((h_cost + g_cost, h_cost, ny, nx, new_state, len(moves) - 1, depth + 1, new_key))
+
+    if profile is not None:
+        profile.search(time_complexity, len(seen), state == goal_state)
 
     return best, time_complexity, space_complexity
 
 
-def bd_astar(base_grid, height, width, goal, heuristic, use_g=True, use_h=True):
+def bd_astar(base_grid, height, width, goal, heuristic, use_g=True, use_h=True, buckets=False, ctx=None):
     """
     Get the shortest path from an initial state to a goal state using bidirectional A* alogrithm
 
@@ -106,6 +240,8 @@ def bd_astar(base_grid, height, width, goal, heuristic, use_g=True, use_h=True):
         heuristic (Function): Heuristic function to use
         use_g (bool, optional): Toggle g cost (length of the current path). Defaults to True.
         use_h (bool, optional): Toggle h cost (heuristic of the current grid). Defaults to True.
+        buckets (bool, optional): Use a bucket queue as open list for integer heuristics. Defaults to False.
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
 
     Returns:
         Tuple[str, int, int]:
@@ -114,103 +250,284 @@ def bd_astar(base_grid, height, width, goal, heuristic, use_g=True, use_h=True):
             - Space complexity (int): The maximum number of states held in memory at any one time.
     """
 
+    return finish(_bd_astar_steps(base_grid, height, width, goal, heuristic, use_g, use_h, buckets, ctx=ctx))
+
+
+def _bd_astar_steps(
+    base_grid, height, width, goal, heuristic, use_g=True, use_h=True, buckets=False, ctx=None, slice_size=None
+):
+    """Stepped form of bd_astar, pausing every slice_size states (see steps)"""
+
     space_complexity = 2
     time_complexity = 0
+    pause = slice_size or math.inf
     best = ""
 
-    gpos = [-1] * (height * width)
-    for i, e in enumerate(goal):
-        gpos[e] = divmod(i, width)
-    gpos = tuple(gpos)
+    # The backward search heads to the initial state without building tables for it (see heuristics.towards)
+    if ctx is None:
+        ctx = heuristics.context(height, width, tuple(goal))
+    bheuristic, bctx, names, offset = heuristics.towards(heuristic, ctx, base_grid)
+
+    delta = heuristics.delta(heuristic)
+    bdelta = heuristics.delta(bheuristic)
+
+    # States are packed into integers, see utils.pack
+    size = height * width
+    bits = utils.cell_bits(size)
+    base_state = utils.pack(base_grid, bits)
+    goal_state = utils.pack(goal, bits)
 
     astart = base_grid.index(0)
     ay, ax = divmod(astart, width)
 
-    aheap = [(0, ay, ax, base_grid, str())]
-    aseen = {}
+    # Nodes of both searches only keep their parent, last move and depth, paths are rebuilt with utils.trace
+    parents = array("l", [0, 1])
+    moves = bytearray(2)
+    depths = array("l", [0, 0])
 
-    bpos = [-1] * (height * width)
-    for i, e in enumerate(base_grid):
-        bpos[e] = divmod(i, width)
-    bpos = tuple(bpos)
+    ah = heuristic(base_grid, ctx) if use_h else 0
+    akey = heuristics.key(heuristic, base_grid, ctx) if use_h else None
+    aheap, apush, apop = open_list((ah, ah, ay, ax, base_state, 0, akey), buckets)
+    aseen = {}
 
     bstart = goal.index(0)
     by, bx = divmod(bstart, width)
 
-    bheap = [(0, by, bx, goal, str())]
+    # Backward nodes carry the heuristic of their renamed grid before the offset is subtracted
+    named = goal if names is None else [names[t] for t in goal]
+    braw = bheuristic(named, bctx) if use_h else 0
+    bkey = heuristics.key(bheuristic, named, bctx) if use_h else None
+    bh = max(braw - offset, 0)
+    bheap, bpush, bpop = open_list((bh, bh, by, bx, goal_state, 1, (braw, bkey)), buckets)
     bseen = {}
 
     while aheap and bheap:
-        ah, ay, ax, agrid, apath = heapq.heappop(aheap)
-        bh, by, bx, bgrid, bpath = heapq.heappop(bheap)
-
-        adepth = len(apath)
-        bdepth = len(bpath)
-
-        if agrid in bseen:
-            best = apath + utils.invert_moves(bseen[agrid][::-1])
-            break
-
-        if bgrid in aseen:
-            best = aseen[bgrid] + utils.invert_moves(bpath[::-1])
-            break
-
-        if agrid == goal:
-            best = apath
-            break
-
-        if bgrid == base_grid:
-            best = utils.invert_moves(bpath[::-1])
-            break
-
-        if agrid == bgrid:
-            best = apath + utils.invert_moves(bpath[::-1])
+        _, ah, ay, ax, astate, anode, akey = apop()
+        _, bh, by, bx, bstate, bnode, (braw, bkey) = bpop()
+
+        adepth = depths[anode]
+        bdepth = depths[bnode]
+
+        meet = None
+        if astate in bseen:
+            meet = anode, bseen[astate]
+        elif bstate in aseen:
+            meet = aseen[bstate], bnode
+        elif astate == goal_state:
+            meet = anode, 1
+        elif bstate == base_state:
+            meet = 0, bnode
+        elif astate == bstate:
+            meet = anode, bnode
+
+        if meet is not None:
+            anode, bnode = meet
+            best = utils.trace(parents, moves, anode) + utils.invert_moves(utils.trace(parents, moves, bnode)[::-1])
             break
 
         time_complexity += 1
         space_complexity = max(space_complexity, len(aheap) + len(bheap) + len(aseen) + len(bseen))
+        if time_complexity >= pause:
+            pause += slice_size
+            yield time_complexity, space_complexity
         # Expand path from start
-        if agrid not in aseen or len(aseen[agrid]) >= adepth:
-            for ny, nx, s in utils.moves(ay, ax, height, width, apath[-1] if apath else ""):
-                new_grid = list(agrid)
-                new_grid[ny * width + nx], new_grid[ay * width + ax] = (
-                    new_grid[ay * width + ax],
-                    new_grid[ny * width + nx],
-                )
-                new_grid = tuple(new_grid)
-                if new_grid not in aseen or len(aseen[new_grid]) >= adepth:
+        if astate not in aseen or depths[aseen[astate]] >= adepth:
+            grid = utils.unpack(astate, size, bits)
+            blank = ay * width + ax
+            for ny, nx, s in utils.moves(ay, ax, height, width, chr(moves[anode]) if anode > 1 else ""):
+                cell = ny * width + nx
+                tile = grid[cell]
+                new_state = astate + (tile << blank * bits) - (tile << cell * bits)
+                if new_state not in aseen or depths[aseen[new_state]] >= adepth:
                     g_cost = adepth if use_g else 0
-                    h_cost = heuristic(new_grid, width, gpos) if use_h else 0
-                    heapq.heappush(aheap, (h_cost + g_cost, ny, nx, new_grid, apath + s))
+                    h_delta, new_key = delta(grid, ctx, cell, blank, akey) if use_h else (0, None)
+                    h_cost = ah + h_delta
+                    parents.append(anode)
+                    moves.append(ord(s))
+                    depths.append(adepth + 1)
+                    apush((h_cost + g_cost, h_cost, ny, nx, new_state, len(moves) - 1, new_key))
 
-            aseen[agrid] = apath
+            aseen[astate] = anode
 
         # Expand path from end
-        if bgrid not in bseen or len(bseen[bgrid]) >= bdepth:
-            for ny, nx, s in utils.moves(by, bx, height, width, bpath[-1] if bpath else ""):
-                new_grid = list(bgrid)
-                new_grid[ny * width + nx], new_grid[by * width + bx] = (
-                    new_grid[by * width + bx],
-                    new_grid[ny * width + nx],
-                )
-                new_grid = tuple(new_grid)
-                if new_grid not in bseen or len(bseen[new_grid]) >= bdepth:
+        if bstate not in bseen or depths[bseen[bstate]] >= bdepth:
+            grid = utils.unpack(bstate, size, bits)
+            named = grid if names is None or not use_h else [names[t] for t in grid]
+            blank = by * width + bx
+            for ny, nx, s in utils.moves(by, bx, height, width, chr(moves[bnode]) if bnode > 1 else ""):
+                cell = ny * width + nx
+                tile = grid[cell]
+                new_state = bstate + (tile << blank * bits) - (tile << cell * bits)
+                if new_state not in bseen or depths[bseen[new_state]] >= bdepth:
                     g_cost = bdepth if use_g else 0
-                    h_cost = heuristic(new_grid, width, bpos) if use_h else 0
-                    heapq.heappush(bheap, (h_cost + g_cost, ny, nx, new_grid, bpath + s))
+                    h_delta, new_key = bdelta(named, bctx, cell, blank, bkey) if use_h else (0, None)
+                    h_cost = max(braw + h_delta - offset, 0)
+                    parents.append(bnode)
+                    moves.append(ord(s))
+                    depths.append(bdepth + 1)
+                    bpush((h_cost + g_cost, h_cost, ny, nx, new_state, len(moves) - 1, (braw + h_delta, new_key)))
 
-            bseen[bgrid] = bpath
+            bseen[bstate] = bnode
 
     return best, time_complexity, space_complexity
 
 
-def id_astar(base_grid, height, width, goal, heuristic):
+def bd_mm(base_grid, height, width, goal, heuristic, buckets=False, ctx=None):
     """
-    Find the shortest path from an initial state to a goal state using the Iterative Deepening A* (IDA*) algorithm.
+    Get the shortest path from an initial state to a goal state using the MM bidirectional heuristic search.
 
-    The IDA* algorithm combines the concepts of iterative deepening depth-first search and A*. It performs a series
-    of depth-first searches with increasing depth limits, using a heuristic to prune paths that exceed the current
-    depth limit. This approach ensures completeness and optimality while using less memory than standard A*.
+    Both directions rank their open states by max(f, 2g), so that neither search goes past the middle of the
+    optimal path. The cheapest path found through a state reached by both directions is kept as incumbent, and the
+    search stops once it costs no more than the lowest priority C of both open lists, which proves it optimal.
+    Each step expands a state of priority C, from the direction with the smallest open list when both have one.
+
+    Args:
+        base_grid (Tuple[int, ....]): Initial state
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Tuple[int, ....]): Goal state
+        heuristic (Function): Heuristic function to use
+        buckets (bool, optional): Use bucket queues as open lists for integer heuristics. Defaults to False.
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
+
+    Returns:
+        Tuple[str, int, int]:
+            - Path (str): The sequence of moves to reach the goal.
+            - Time complexity (int): The number of states explored.
+            - Space complexity (int): The maximum number of states held in memory at any one time.
+    """
+
+    return finish(_bd_mm_steps(base_grid, height, width, goal, heuristic, buckets, ctx=ctx))
+
+
+def _bd_mm_steps(base_grid, height, width, goal, heuristic, buckets=False, ctx=None, slice_size=None):
+    """Stepped form of bd_mm, pausing every slice_size states (see steps)"""
+
+    space_complexity = 2
+    time_complexity = 0
+    pause = slice_size or math.inf
+
+    if tuple(base_grid) == tuple(goal):
+        return "", time_complexity, space_complexity
+
+    # The backward search heads to base_grid without building tables for it (see heuristics.towards)
+    if ctx is None:
+        ctx = heuristics.context(height, width, tuple(goal))
+    bheuristic, bctx, names, offset = heuristics.towards(heuristic, ctx, base_grid)
+
+    # States are packed into integers, see utils.pack
+    size = height * width
+    bits = utils.cell_bits(size)
+
+    # Nodes of both searches only keep their parent and last move, paths are rebuilt with utils.trace
+    parents = array("l", [0, 1])
+    moves = bytearray(2)
+
+    # Forward search towards goal then backward search towards base_grid: delta, context, names of the tiles and
+    # heuristic offset, open list, best depth and node of each reached state, and expanded states. Nodes carry the
+    # heuristic before the offset is subtracted with its key
+    sides = []
+    for node, (start, side_heuristic, side_ctx, side_names, side_offset) in enumerate(
+        ((base_grid, heuristic, ctx, None, 0), (goal, bheuristic, bctx, names, offset))
+    ):
+        named = start if side_names is None else [side_names[t] for t in start]
+        raw = side_heuristic(named, side_ctx)
+        key = raw, heuristics.key(side_heuristic, named, side_ctx)
+        h = max(raw - side_offset, 0)
+        y, x = divmod(start.index(0), width)
+        state = utils.pack(start, bits)
+        sides.append(
+            (
+                heuristics.delta(side_heuristic),
+                side_ctx,
+                side_names,
+                side_offset,
+                open_list((h, h, y, x, state, node, 0, key), buckets),
+                {state: (0, node)},
+                set(),
+            )
+        )
+
+    incumbent = math.inf
+    meet = None
+
+    def lowest(side):
+        """Drop the outdated entries of an open list and get its lowest priority"""
+
+        *_, (heap, push, pop), reached, closed = side
+        while heap:
+            entry = pop()
+            state, depth = entry[4], entry[6]
+            if state not in closed and reached[state][0] == depth:
+                push(entry)
+                return entry[0]
+        return math.inf
+
+    while True:
+        forward, backward = lowest(sides[0]), lowest(sides[1])
+        bound = min(forward, backward)
+        if incumbent <= bound:
+            break
+
+        if forward != backward:
+            direction = forward > backward
+        else:
+            direction = len(sides[1][4][0]) < len(sides[0][4][0])
+
+        delta, side_ctx, side_names, side_offset, (heap, push, pop), reached, closed = sides[direction]
+        other = sides[not direction][5]
+
+        _, h, y, x, state, node, depth, (raw, key) = pop()
+        closed.add(state)
+
+        time_complexity += 1
+        space_complexity = max(space_complexity, sum(len(side[4][0]) + len(side[5]) for side in sides))
+        if time_complexity >= pause:
+            pause += slice_size
+            yield time_complexity, space_complexity
+
+        grid = utils.unpack(state, size, bits)
+        named = grid if side_names is None else [side_names[t] for t in grid]
+        blank = y * width + x
+        for ny, nx, s in utils.moves(y, x, height, width, chr(moves[node]) if node > 1 else ""):
+            cell = ny * width + nx
+            tile = grid[cell]
+            new_state = state + (tile << blank * bits) - (tile << cell * bits)
+            if new_state in reached and reached[new_state][0] <= depth + 1:
+                continue
+
+            closed.discard(new_state)
+            h_delta, new_key = delta(named, side_ctx, cell, blank, key)
+            h_cost = max(raw + h_delta - side_offset, 0)
+            parents.append(node)
+            moves.append(ord(s))
+            new_node = len(moves) - 1
+            reached[new_state] = depth + 1, new_node
+            priority = max(depth + 1 + h_cost, 2 * (depth + 1))
+            push((priority, h_cost, ny, nx, new_state, new_node, depth + 1, (raw + h_delta, new_key)))
+
+            if new_state in other and depth + 1 + other[new_state][0] < incumbent:
+                incumbent = depth + 1 + other[new_state][0]
+                meet = (new_node, other[new_state][1]) if not direction else (other[new_state][1], new_node)
+
+    if meet is None:
+        return "", time_complexity, space_complexity
+
+    anode, bnode = meet
+    best = utils.trace(parents, moves, anode) + utils.invert_moves(utils.trace(parents, moves, bnode)[::-1])
+    return best, time_complexity, space_complexity
+
+
+def ara_star(
+    base_grid, height, width, goal, heuristic, weight=2.0, step=0.5, time_limit=None, on_solution=None, ctx=None
+):
+    """
+    Find a path from an initial state to a goal state with the anytime repairing A* (ARA*) algorithm.
+
+    A first weighted A* search, ranking states by g + weight * h, quickly finds a path at most weight times longer
+    than the optimal one. The weight is then lowered by step until 1, each search reusing the states already
+    reached: only the open states and the closed states whose path got shorter (inconsistent ones) are searched
+    again. After each search, the solution length over the lowest g + h of those states bounds its suboptimality.
 
     Args:
         base_grid (Tuple[int, ...]): Initial state of the grid.
@@ -218,6 +535,13 @@ def id_astar(base_grid, height, width, goal, heuristic):
         width (int): Number of columns in the grid.
         goal (Tuple[int, ...]): Goal state of the grid.
         heuristic (Function): Heuristic function to estimate the distance to the goal.
+        weight (float, optional): Weight of the heuristic of the first search. Defaults to 2.0.
+        step (float, optional): Decrease of the weight between two searches. Defaults to 0.5.
+        time_limit (float, optional): Seconds after which the best path found is returned, the first path is
+            always waited for. Defaults to None (until the path is proven optimal).
+        on_solution (Function, optional): Called after each search with the best path and its suboptimality bound.
+            Defaults to None.
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
 
     Returns:
         Tuple[str, int, int]:
@@ -226,63 +550,424 @@ def id_astar(base_grid, height, width, goal, heuristic):
             - Space complexity (int): The maximum number of states held in memory at any one time.
     """
 
+    return finish(
+        _ara_star_steps(base_grid, height, width, goal, heuristic, weight, step, time_limit, on_solution, ctx=ctx)
+    )
+
+
+def _ara_star_steps(
+    base_grid, height, width, goal, heuristic, weight=2.0, step=0.5, time_limit=None, on_solution=None, ctx=None,
+    slice_size=None
+):
+    """Stepped form of ara_star, pausing every slice_size states (see steps)"""
+
+    deadline = None if time_limit is None else time.monotonic() + time_limit
     space_complexity = 1
     time_complexity = 0
+    pause = slice_size or math.inf
+
+    if ctx is None:
+        ctx = heuristics.context(height, width, tuple(goal))
+    delta = heuristics.delta(heuristic)
+
+    # States are packed into integers, see utils.pack
+    size = height * width
+    bits = utils.cell_bits(size)
+    goal_state = utils.pack(goal, bits)
+
+    h = heuristic(base_grid, ctx)
+    key = heuristics.key(heuristic, base_grid, ctx)
+    y, x = divmod(base_grid.index(0), width)
+    state = utils.pack(base_grid, bits)
+
+    # Nodes only keep their parent and last move, paths are rebuilt with utils.trace
+    parents = array("l", [0])
+    moves = bytearray(1)
+
+    # Best depth and node of each reached state, entries are (priority, h, depth, y, x, state, node, heuristic key)
+    reached = {state: (0, 0)}
+    heap = [(weight * h, h, 0, y, x, state, 0, key)]
+    closed = set()
+    inconsistent = {}
+
+    while True:
+        # Improve the path with the current weight
+        while heap and heap[0][0] < reached.get(goal_state, (math.inf,))[0]:
+            if not time_complexity & 1023 and deadline is not None and goal_state in reached and time.monotonic() > deadline:
+                break
+            _, h, depth, y, x, state, node, key = heapq.heappop(heap)
+            if state in closed or reached[state][0] != depth:
+                continue
+            closed.add(state)
+
+            time_complexity += 1
+            space_complexity = max(space_complexity, len(heap) + len(reached))
+            if time_complexity >= pause:
+                pause += slice_size
+                yield time_complexity, space_complexity
+
+            grid = utils.unpack(state, size, bits)
+            blank = y * width + x
+            for ny, nx, s in utils.moves(y, x, height, width, chr(moves[node]) if node else ""):
+                cell = ny * width + nx
+                tile = grid[cell]
+                new_state = state + (tile << blank * bits) - (tile << cell * bits)
+                if new_state in reached and reached[new_state][0] <= depth + 1:
+                    continue
+
+                h_delta, new_key = delta(grid, ctx, cell, blank, key)
+                h_cost = h + h_delta
+                parents.append(node)
+                moves.append(ord(s))
+                reached[new_state] = depth + 1, len(moves) - 1
+                entry = (depth + 1 + weight * h_cost, h_cost, depth + 1, ny, nx, new_state, len(moves) - 1, new_key)
+                if new_state in closed:
+                    inconsistent[new_state] = entry
+                else:
+                    heapq.heappush(heap, entry)
+
+        if goal_state not in reached:
+            return "", time_complexity, space_complexity
+
+        # The open and inconsistent states hold a prefix of any shorter path, so their lowest g + h bounds its length
+        entries = [entry for entry in heap if entry[5] not in closed and reached[entry[5]][0] == entry[2]]
+        entries.extend(inconsistent.values())
+        solution = reached[goal_state][0]
+        lowest = min((entry[2] + entry[1] for entry in entries), default=math.inf)
+        bound = max(1.0, solution / lowest) if solution and lowest else 1.0
+        if not heap or heap[0][0] >= solution:
+            # Only a completed search proves its weight
+            bound = min(bound, weight)
+
+        best = utils.trace(parents, moves, reached[goal_state][1])
+        if on_solution is not None:
+            on_solution(best, bound)
+
+        if bound <= 1 or weight <= 1 or (deadline is not None and time.monotonic() > deadline):
+            return best, time_complexity, space_complexity
+
+        # Next search with a lower weight, from the open and inconsistent states
+        weight = max(1.0, weight - step)
+        heap = list({entry[5]: (entry[2] + weight * entry[1],) + entry[1:] for entry in entries}.values())
+        heapq.heapify(heap)
+        closed = set()
+        inconsistent = {}
+
+
+def batch_astar(base_grid, height, width, goal, heuristic, slab=256, ctx=None):
+    """
+    Get the shortest path from an initial state to a goal state using A* with heuristics evaluated in batches.
+
+    Up to slab open states sharing the lowest f cost are expanded together, and all their children are scored by a
+    single call of the NumPy form of the heuristic (see vectorized.batch). A slab of 1 scores the children of one
+    state together. Every state of a slab has the lowest f cost of the open list, so the first goal popped is
+    still optimal.
+
+    Args:
+        base_grid (Tuple[int, ...]): Initial state of the grid.
+        height (int): Number of rows in the grid.
+        width (int): Number of columns in the grid.
+        goal (Tuple[int, ...]): Goal state of the grid.
+        heuristic (Function): Heuristic function to estimate the distance to the goal.
+        slab (int, optional): Maximum number of states expanded together. Defaults to 256.
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
+
+    Raises:
+        RuntimeError: If NumPy is not installed or the tiles do not fit in vectorized.DTYPE
+
+    Returns:
+        Tuple[str, int, int]:
+            - Path (str): The sequence of moves to reach the goal.
+            - Time complexity (int): The number of states explored.
+            - Space complexity (int): The maximum number of states held in memory at any one time.
+    """
+
+    return finish(_batch_astar_steps(base_grid, height, width, goal, heuristic, slab, ctx=ctx))
+
+
+def _batch_astar_steps(base_grid, height, width, goal, heuristic, slab=256, ctx=None, slice_size=None):
+    """Stepped form of batch_astar, pausing every slice_size states (see steps)"""
+
+    space_complexity = 1
+    time_complexity = 0
+    pause = slice_size or math.inf
     best = ""
 
-    gpos = [-1] * (height * width)
-    for i, e in enumerate(goal):
-        gpos[e] = divmod(i, width)
-    gpos = tuple(gpos)
+    if ctx is None:
+        ctx = heuristics.context(height, width, tuple(goal))
 
-    goal = list(goal)
-    base_grid = list(base_grid)
+    score = vectorized.batch(heuristic)
+    dtype = vectorized.np.dtype(vectorized.DTYPE)
+    size = height * width
+    if size > 1 << (8 * dtype.itemsize):
+        raise RuntimeError(f"Batch heuristics are limited to {1 << (8 * dtype.itemsize)} cells")
 
-    start = base_grid.index(0)
-    sy, sx = divmod(start, width)
+    # States are the bytes of their grid, so that a batch of states is one buffer
+    goal_state = bytes(goal)
+    state = bytes(base_grid)
+    h = heuristic(base_grid, ctx)
+    parents = array("l", [0])
+    moves = bytearray(1)
+
+    heap = [(h, h, base_grid.index(0), state, 0, 0)]
+    seen = {}
 
-    max_depth = 1
-    while not best:
-        stack = deque([(base_grid, sy, sx, str())])
+    while heap:
+        # Expand a slab of states sharing the lowest f cost
+        f = heap[0][0]
+        expanded = []
+        while heap and heap[0][0] == f and len(expanded) < slab:
+            _, h, blank, state, node, depth = heapq.heappop(heap)
 
-        while stack:
-            grid, y, x, path = stack.popleft()
+            if state == goal_state:
+                return utils.trace(parents, moves, node), time_complexity, space_complexity
 
-            depth = len(path)
+            if state in seen and seen[state] < depth:
+                continue
 
-            if grid == goal:
-                best = path
-                break
+            seen[state] = depth
+            time_complexity += 1
+            expanded.append((blank, state, node, depth))
+
+        space_complexity = max(space_complexity, len(heap) + len(seen))
+        if time_complexity >= pause:
+            pause += slice_size
+            yield time_complexity, space_complexity
+
+        children = []
+        entries = []
+        for blank, state, node, depth in expanded:
+            y, x = divmod(blank, width)
+            for ny, nx, s in utils.moves(y, x, height, width, chr(moves[node]) if node else ""):
+                cell = ny * width + nx
+                # Make the move
+                child = bytearray(state)
+                child[blank], child[cell] = child[cell], 0
+                child = bytes(child)
+                if child not in seen or depth < seen[child]:
+                    parents.append(node)
+                    moves.append(ord(s))
+                    children.append(child)
+                    entries.append((cell, len(moves) - 1, depth + 1))
+
+        if not children:
+            continue
+
+        states = vectorized.np.frombuffer(b"".join(children), dtype=dtype).reshape(len(children), size)
+        for h_cost, child, (cell, node, depth) in zip(score(states, ctx).tolist(), children, entries):
+            heapq.heappush(heap, (h_cost + depth, h_cost, cell, child, node, depth))
+
+    return best, time_complexity, space_complexity
+
+
+def next_bound(f, parity):
+    """
+    Round an IDA* f-limit up to the next integer with the parity of the solution length.
+
+    Every move changes the parity of the blank position, so all solutions share the parity of the distance between
+    the initial and the goal positions of the blank and the limit always grows by steps of at least 2. Costs within
+    EPSILON of an integer round to it, so that the drift of summed float heuristics does not skip a limit.
+
+    Args:
+        f (float): Smallest f cost that exceeded the previous limit.
+        parity (int): Parity of the solution length.
+
+    Returns:
+        int: The next limit.
+    """
+
+    bound = math.ceil(f - EPSILON)
+    return bound + ((bound - parity) & 1)
+
+
+def bounded_search(grid, y, x, h, key, fsm, depth, bound, height, width, goal, ctx, delta, automaton, stop=None):
+    """
+    Explore depth first the paths below a node whose f cost stays within a limit, as one IDA* iteration.
 
+    The search runs on an explicit stack of move iterators over a single grid, moves being made and undone in place,
+    so that memory stays linear in the depth of the search. The grid is restored unless a solution is found.
+
+    Args:
+        grid (List[int]): State of the node, modified during the search.
+        y (int): Row of the blank.
+        x (int): Column of the blank.
+        h (float): Heuristic of the node.
+        key (Any): Heuristic key of the node (see heuristics.key).
+        fsm (int): State of the move pruning automaton at the node.
+        depth (int): Path length from the initial state to the node.
+        bound (float): Limit of the f cost.
+        height (int): Number of rows in the grid.
+        width (int): Number of columns in the grid.
+        goal (List[int]): Goal state of the grid.
+        ctx (heuristics.Context): Heuristic context of the goal.
+        delta (Function): Incremental form of the heuristic (see heuristics.delta).
+        automaton (Tuple[Dict[str, int], ...]): Move pruning automaton (see move_pruning.automaton).
+        stop (multiprocessing.Event, optional): Abort the search once set, checked every 4096 states. Defaults to None.
+
+    Returns:
+        Tuple[Optional[str], int, int, float]:
+            - Path (str): The moves from the node to the goal, None if there are none within the limit.
+            - Time complexity (int): The number of states explored.
+            - Space complexity (int): The maximum number of states held in memory at any one time.
+            - Exceeded (float): The smallest f cost that exceeded the limit.
+    """
+
+    return finish(
+        _bounded_search_steps(grid, y, x, h, key, fsm, depth, bound, height, width, goal, ctx, delta, automaton, stop)
+    )
+
+
+def _bounded_search_steps(
+    grid, y, x, h, key, fsm, depth, bound, height, width, goal, ctx, delta, automaton, stop=None, slice_size=None
+):
+    """Stepped form of bounded_search, pausing every slice_size states (see steps)"""
+
+    time_complexity = 0
+    space_complexity = 1
+    exceeded = math.inf
+    pause = slice_size or math.inf
+
+    path = []
+    stack = [(y, x, h, key, fsm, utils.moves(y, x, height, width, ""))]
+
+    while stack:
+        y, x, h, key, fsm, children = stack[-1]
+
+        for ny, nx, s in children:
+            new_fsm = automaton[fsm][s]
+            if new_fsm < 0:
+                continue
+
+            h_delta, new_key = delta(grid, ctx, ny * width + nx, y * width + x, key)
+            h_cost = h + h_delta
+            f_cost = depth + len(path) + 1 + h_cost
+            if f_cost > bound + EPSILON:
+                exceeded = min(exceeded, f_cost)
+                continue
+
+            # Make the move, it is undone once its subtree is exhausted
+            grid[ny * width + nx], grid[y * width + x] = grid[y * width + x], grid[ny * width + nx]
+            path.append(s)
             time_complexity += 1
+            if time_complexity >= pause:
+                pause += slice_size
+                yield time_complexity, space_complexity
+
+            if grid == goal:
+                return "".join(path), time_complexity, max(space_complexity, len(stack) + 1), exceeded
+
+            if not time_complexity & 4095 and stop is not None and stop.is_set():
+                return None, time_complexity, space_complexity, math.inf
+
+            stack.append((ny, nx, h_cost, new_key, new_fsm, utils.moves(ny, nx, height, width, "")))
             space_complexity = max(space_complexity, len(stack))
+            break
 
-            for ny, nx, s in utils.moves(y, x, height, width, path[-1] if path else ""):
-                new_grid = grid.copy()
-                new_grid[ny * width + nx], new_grid[y * width + x] = (
-                    new_grid[y * width + x],
-                    new_grid[ny * width + nx],
-                )
+        else:
+            stack.pop()
+            if stack:
+                py, px = stack[-1][:2]
+                grid[py * width + px], grid[y * width + x] = grid[y * width + x], grid[py * width + px]
+                path.pop()
 
-                g_cost = depth
-                h_cost = heuristic(new_grid, width, gpos)
+    return None, time_complexity, space_complexity, exceeded
 
-                if h_cost + g_cost <= max_depth:
-                    stack.append((new_grid, ny, nx, path + s))
 
-        max_depth += 1
+def id_astar(base_grid, height, width, goal, heuristic, pruning_length=2, min_bound=0, ctx=None):
+    """
+    Find the shortest path from an initial state to a goal state using the Iterative Deepening A* (IDA*) algorithm.
 
-    return best, time_complexity, space_complexity
+    The IDA* algorithm combines the concepts of iterative deepening depth-first search and A*. It performs a series
+    of depth-first searches bounded by an f cost limit, using a heuristic to prune paths that exceed it. Each new
+    limit is the smallest f cost that exceeded the previous one. This approach ensures completeness and optimality
+    while using less memory than standard A*.
+
+    Each iteration is a bounded_search from the initial state, whose memory stays linear in the depth of the search.
+
+    Args:
+        base_grid (Tuple[int, ...]): Initial state of the grid.
+        height (int): Number of rows in the grid.
+        width (int): Number of columns in the grid.
+        goal (Tuple[int, ...]): Goal state of the grid.
+        heuristic (Function): Heuristic function to estimate the distance to the goal.
+        pruning_length (int, optional): Maximum length of the duplicate move sequences pruned. Defaults to 2.
+        min_bound (float, optional): Known lower bound of the solution length, to skip smaller limits. Defaults to 0.
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
+
+    Returns:
+        Tuple[str, int, int]:
+            - Path (str): The sequence of moves to reach the goal.
+            - Time complexity (int): The number of states explored.
+            - Space complexity (int): The maximum number of states held in memory at any one time.
+    """
+
+    return finish(_id_astar_steps(base_grid, height, width, goal, heuristic, pruning_length, min_bound, ctx=ctx))
+
+
+def _id_astar_steps(
+    base_grid, height, width, goal, heuristic, pruning_length=2, min_bound=0, ctx=None, slice_size=None
+):
+    """Stepped form of id_astar, pausing every slice_size states (see steps)"""
+
+    space_complexity = 1
+    time_complexity = 0
+
+    if ctx is None:
+        ctx = heuristics.context(height, width, tuple(goal))
+
+    goal = list(goal)
+    grid = list(base_grid)
+
+    delta = heuristics.delta(heuristic)
+    automaton = move_pruning.automaton(pruning_length)
+
+    start = grid.index(0)
+    sy, sx = divmod(start, width)
+    sh = heuristic(grid, ctx)
+    skey = heuristics.key(heuristic, grid, ctx)
+
+    gy, gx = divmod(goal.index(0), width)
+    parity = (sy + sx + gy + gx) & 1
+
+    if grid == goal:
+        return "", time_complexity, space_complexity
+
+    bound = next_bound(max(sh, min_bound), parity)
+    while True:
+        path, time, space, exceeded = yield from _shifted(
+            _bounded_search_steps(
+                grid, sy, sx, sh, skey, 0, 0, bound, height, width, goal, ctx, delta, automaton, slice_size=slice_size
+            ),
+            time_complexity,
+            space_complexity,
+        )
+        time_complexity += time
+        space_complexity = max(space_complexity, space)
+
+        if path is not None:
+            return path, time_complexity, space_complexity
+        if exceeded == math.inf:
+            return "", time_complexity, space_complexity
 
+        bound = next_bound(exceeded, parity)
 
-def id_astar_rec(base_grid, height, width, goal, heuristic):
+
+def id_astar_rec(base_grid, height, width, goal, heuristic, transposition_size=0, pruning_length=2, ctx=None):
     """
     Find the shortest path from an initial state to a goal state using the recursive Iterative Deepening A* (IDA*) algorithm.
 
     This function implements the IDA* algorithm recursively, which combines the principles of iterative deepening
     depth-first search and A*. It performs a series of depth-first searches with increasing depth limits, using
     a heuristic to prune paths that exceed the current depth limit. This approach ensures completeness and
-    optimality while using less memory than standard A*.
+    optimality while using less memory than standard A*. Each new depth limit is the smallest f cost that exceeded
+    the previous one, rounded up to the parity of the solution length (see next_bound).
+
+    Two optional enhancements cut the re-expansions of the same states:
+        - A transposition table of fixed size keeping the smallest g reached for each state, across iterations.
+          States reached again with a larger g are pruned. Colliding entries are replaced by shallower ones, or
+          by any entry once they were not refreshed during the current iteration.
+        - A move pruning automaton (see move_pruning.automaton) rejecting every move sequence of at most
+          pruning_length moves that has a shorter or equivalent earlier alternative, instead of only undoing moves.
 
     Args:
         base_grid (Tuple[int, ...]): Initial state of the grid.
@@ -290,6 +975,9 @@ def id_astar_rec(base_grid, height, width, goal, heuristic):
         width (int): Number of columns in the grid.
         goal (Tuple[int, ...]): Goal state of the grid.
         heuristic (function): Heuristic function to estimate the distance to the goal.
+        transposition_size (int, optional): Number of entries of the transposition table, 0 to disable it. Defaults to 0.
+        pruning_length (int, optional): Maximum length of the duplicate move sequences pruned. Defaults to 2.
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
 
     Returns:
         Tuple[str, int, int]:
@@ -298,61 +986,316 @@ def id_astar_rec(base_grid, height, width, goal, heuristic):
             - Space complexity (int): The maximum number of states held in memory at any one time.
     """
 
-    def search(grid, y, x, max_depth, height, width, goal, heuristic, path, gpos):
-        """Perform a depth-limited search from the current state using the heuristic to prune paths."""
+    return finish(
+        _id_astar_rec_steps(base_grid, height, width, goal, heuristic, transposition_size, pruning_length, ctx=ctx)
+    )
+
+
+def _id_astar_rec_steps(
+    base_grid, height, width, goal, heuristic, transposition_size=0, pruning_length=2, ctx=None, slice_size=None
+):
+    """Stepped form of id_astar_rec, pausing every slice_size states (see steps)"""
+
+    def search(grid, state, fsm, y, x, h, key, max_depth, height, width, goal, delta, path, ctx):
+        """Perform a depth-limited search from the current state using the heuristic to prune paths.
+        Also returns the smallest f cost exceeding the limit, None being returned as path when no solution is found.
+        Pauses go up the recursion through yield from."""
+
+        stats[0] += 1
+        if stats[0] >= stats[1]:
+            stats[1] += slice_size
+            yield stats[0], len(path) + 1
 
         if grid == goal:
-            return path, 1, 0
+            return path, 1, 0, math.inf
+
+        if transposition_size:
+            slot = state % transposition_size
+            if keys[slot] == state:
+                if costs[slot] < len(path):
+                    return None, 1, 0, math.inf
+                costs[slot] = len(path)
+                ages[slot] = max_depth
+            elif keys[slot] is None or len(path) <= costs[slot] or ages[slot] < max_depth:
+                keys[slot] = state
+                costs[slot] = len(path)
+                ages[slot] = max_depth
 
         time_complexity = 1
         space_complexity = 1
+        exceeded = math.inf
 
-        for ny, nx, s in utils.moves(y, x, height, width, path[-1] if path else ""):
-            grid[ny * width + nx], grid[y * width + x] = grid[y * width + x], grid[ny * width + nx]
+        for ny, nx, s in utils.moves(y, x, height, width, ""):
+            new_fsm = automaton[fsm][s]
+            if new_fsm < 0:
+                continue
 
             g_cost = len(path) + 1
-            h_cost = heuristic(grid, width, gpos)
+            h_delta, new_key = delta(grid, ctx, ny * width + nx, y * width + x, key)
+            h_cost = h + h_delta
+
+            new_state = state
+            if transposition_size:
+                tile = grid[ny * width + nx]
+                new_state += (tile << (y * width + x) * bits) - (tile << (ny * width + nx) * bits)
 
-            if h_cost + g_cost <= max_depth:
-                solution, time, space = search(
-                    grid, ny, nx, max_depth, height, width, goal, heuristic, path + s, gpos
+            grid[ny * width + nx], grid[y * width + x] = grid[y * width + x], grid[ny * width + nx]
+
+            if h_cost + g_cost <= max_depth + EPSILON:
+                solution, time, space, child_exceeded = yield from search(
+                    grid, new_state, new_fsm, ny, nx, h_cost, new_key, max_depth, height, width, goal, delta, path + s, ctx
                 )
                 time_complexity += time
-                if solution:
-                    return solution, time_complexity, space_complexity + space
+                if solution is not None:
+                    return solution, time_complexity, space_complexity + space, math.inf
+                exceeded = min(exceeded, child_exceeded)
+            else:
+                exceeded = min(exceeded, h_cost + g_cost)
 
             grid[ny * width + nx], grid[y * width + x] = grid[y * width + x], grid[ny * width + nx]
 
-        return "", time_complexity, space_complexity
+        return None, time_complexity, space_complexity, exceeded
 
     space_complexity = 1
     time_complexity = 0
-    best = ""
+    # States explored across the iterations and the count of the next pause
+    stats = [0, slice_size or math.inf]
 
-    gpos = [-1] * (height * width)
-    for i, e in enumerate(goal):
-        gpos[e] = divmod(i, width)
-    gpos = tuple(gpos)
+    if ctx is None:
+        ctx = heuristics.context(height, width, tuple(goal))
 
     goal = list(goal)
     base_grid = list(base_grid)
 
+    delta = heuristics.delta(heuristic)
+    automaton = move_pruning.automaton(pruning_length)
+
+    # Transposition table entries: packed state, smallest g and iteration of the last visit
+    bits = utils.cell_bits(height * width)
+    keys = [None] * transposition_size
+    costs = array("l", [0]) * transposition_size
+    ages = array("l", [0]) * transposition_size
+
     start = base_grid.index(0)
     sy, sx = divmod(start, width)
+    sh = heuristic(base_grid, ctx)
+    skey = heuristics.key(heuristic, base_grid, ctx)
 
-    max_depth = 1
-    while not best:
-        best, time, space = search(
-            base_grid, sy, sx, max_depth, height, width, goal, heuristic, "", gpos
+    gy, gx = divmod(goal.index(0), width)
+    parity = (sy + sx + gy + gx) & 1
+
+    max_depth = next_bound(sh, parity)
+    while True:
+        best, time, space, exceeded = yield from search(
+            base_grid, utils.pack(base_grid, bits), 0, sy, sx, sh, skey, max_depth, height, width, goal, delta, "", ctx
         )
         time_complexity += time
         space_complexity = max(space_complexity, space)
-        max_depth += 1
+        if best is not None:
+            break
+        if exceeded == math.inf:
+            best = ""
+            break
+        max_depth = next_bound(exceeded, parity)
 
     return best, time_complexity, space_complexity
 
 
-def greedy(base_grid, height, width, goal, heuristic):
+# Constants of the parallel_id_astar workers, set by _init_worker
+_worker = {}
+
+
+def _init_worker(stop, height, width, goal, heuristic, pruning_length, ignore_interrupt=True, ctx=None):
+    """Set up a parallel_id_astar worker process, or the current one when running without a pool, reusing ctx."""
+
+    if ignore_interrupt:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    _worker.update(
+        stop=stop,
+        height=height,
+        width=width,
+        goal=list(goal),
+        ctx=heuristics.context(height, width, tuple(goal)) if ctx is None else ctx,
+        delta=heuristics.delta(heuristic),
+        automaton=move_pruning.automaton(pruning_length),
+    )
+
+
+def _search_subtree(task):
+    """Run a bounded_search below a frontier node of parallel_id_astar in a worker process."""
+
+    index, grid, h, key, fsm, depth, bound = task
+    w = _worker
+    y, x = divmod(grid.index(0), w["width"])
+    result = bounded_search(
+        list(grid), y, x, h, key, fsm, depth, bound,
+        w["height"], w["width"], w["goal"], w["ctx"], w["delta"], w["automaton"], w["stop"]
+    )
+    return index, *result
+
+
+def _search_subtree_steps(task, slice_size=None):
+    """Stepped form of _search_subtree, running in the current process (see steps)"""
+
+    index, grid, h, key, fsm, depth, bound = task
+    w = _worker
+    y, x = divmod(grid.index(0), w["width"])
+    result = yield from _bounded_search_steps(
+        list(grid), y, x, h, key, fsm, depth, bound,
+        w["height"], w["width"], w["goal"], w["ctx"], w["delta"], w["automaton"], w["stop"], slice_size
+    )
+    return index, *result
+
+
+def parallel_id_astar(
+    base_grid, height, width, goal, heuristic, jobs=None, pruning_length=2, frontier_size=2048, ctx=None
+):
+    """
+    Find the shortest path from an initial state to a goal state using a parallel Iterative Deepening A* (IDA*) algorithm.
+
+    The initial state is first expanded breadth first into a frontier of about frontier_size independent subtrees.
+    Each IDA* iteration then distributes the bounded searches of these subtrees (see bounded_search) over a pool of
+    worker processes. Limits follow the same rule as id_astar, so the first solution found within a limit is optimal
+    and ends the iteration for every worker.
+
+    Args:
+        base_grid (Tuple[int, ...]): Initial state of the grid.
+        height (int): Number of rows in the grid.
+        width (int): Number of columns in the grid.
+        goal (Tuple[int, ...]): Goal state of the grid.
+        heuristic (Function): Heuristic function to estimate the distance to the goal.
+        jobs (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        pruning_length (int, optional): Maximum length of the duplicate move sequences pruned. Defaults to 2.
+        frontier_size (int, optional): Minimum number of subtrees to distribute. Defaults to 2048.
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
+
+    Returns:
+        Tuple[str, int, int]:
+            - Path (str): The sequence of moves to reach the goal.
+            - Time complexity (int): The number of states explored.
+            - Space complexity (int): The maximum number of states held in memory at any one time.
+    """
+
+    return finish(
+        _parallel_id_astar_steps(
+            base_grid, height, width, goal, heuristic, jobs, pruning_length, frontier_size, ctx=ctx
+        )
+    )
+
+
+def _parallel_id_astar_steps(
+    base_grid, height, width, goal, heuristic, jobs=None, pruning_length=2, frontier_size=2048, ctx=None,
+    slice_size=None
+):
+    """Stepped form of parallel_id_astar, pausing between the results of the subtrees (see steps)
+
+    Closing the search terminates its pool. A single job runs the subtrees in this process and pauses inside them.
+    """
+
+    space_complexity = 1
+    time_complexity = 0
+    pause = slice_size or math.inf
+
+    if ctx is None:
+        ctx = heuristics.context(height, width, tuple(goal))
+
+    goal = tuple(goal)
+    base_grid = tuple(base_grid)
+
+    delta = heuristics.delta(heuristic)
+    automaton = move_pruning.automaton(pruning_length)
+
+    sy, sx = divmod(base_grid.index(0), width)
+    gy, gx = divmod(goal.index(0), width)
+    parity = (sy + sx + gy + gx) & 1
+
+    if base_grid == goal:
+        return "", time_complexity, space_complexity
+
+    # Frontier nodes: grid, path, heuristic and its key, and automaton state, solutions shallower than the frontier
+    # are found here
+    frontier = [(base_grid, "", heuristic(base_grid, ctx), heuristics.key(heuristic, base_grid, ctx), 0)]
+    while frontier and len(frontier) < frontier_size:
+        upper = []
+        for grid, path, h, key, fsm in frontier:
+            y, x = divmod(grid.index(0), width)
+            for ny, nx, s in utils.moves(y, x, height, width, ""):
+                new_fsm = automaton[fsm][s]
+                if new_fsm < 0:
+                    continue
+                new_grid = list(grid)
+                h_delta, new_key = delta(new_grid, ctx, ny * width + nx, y * width + x, key)
+                h_cost = h + h_delta
+                new_grid[ny * width + nx], new_grid[y * width + x] = new_grid[y * width + x], new_grid[ny * width + nx]
+                new_grid = tuple(new_grid)
+                time_complexity += 1
+                if new_grid == goal:
+                    return path + s, time_complexity, max(space_complexity, len(upper) + 1)
+                upper.append((new_grid, path + s, h_cost, new_key, new_fsm))
+        frontier = upper
+        space_complexity = max(space_complexity, len(frontier))
+        if time_complexity >= pause:
+            pause = time_complexity + slice_size
+            yield time_complexity, space_complexity
+
+    if not frontier:
+        return "", time_complexity, space_complexity
+
+    # Most promising subtrees first
+    frontier.sort(key=lambda node: node[2])
+    depth = len(frontier[0][1])
+
+    # A single job runs the subtrees in order in this process, which also allows running inside daemonic workers
+    if jobs == 1:
+        stop = pool = None
+        _init_worker(stop, height, width, goal, heuristic, pruning_length, False, ctx)
+    else:
+        stop = multiprocessing.Event()
+        pool = multiprocessing.Pool(
+            jobs, initializer=_init_worker, initargs=(stop, height, width, goal, heuristic, pruning_length)
+        )
+
+    try:
+        bound = next_bound(frontier[0][2] + depth, parity)
+        while True:
+            exceeded = math.inf
+            tasks = []
+            for i, (grid, path, h, key, fsm) in enumerate(frontier):
+                if depth + h > bound + EPSILON:
+                    exceeded = min(exceeded, depth + h)
+                else:
+                    tasks.append((i, grid, h, key, fsm, depth, bound))
+
+            results = None if pool is None else pool.imap_unordered(_search_subtree, tasks)
+            for task in tasks:
+                if pool is None:
+                    i, path, time, space, sub_exceeded = yield from _shifted(
+                        _search_subtree_steps(task, slice_size), time_complexity, space_complexity
+                    )
+                else:
+                    i, path, time, space, sub_exceeded = next(results)
+                time_complexity += time
+                space_complexity = max(space_complexity, len(frontier) + space)
+                if path is not None:
+                    if stop is not None:
+                        stop.set()
+                    return frontier[i][1] + path, time_complexity, space_complexity
+                exceeded = min(exceeded, sub_exceeded)
+                if time_complexity >= pause:
+                    pause = time_complexity + slice_size
+                    yield time_complexity, space_complexity
+
+            if exceeded == math.inf:
+                return "", time_complexity, space_complexity
+
+            bound = next_bound(exceeded, parity)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def greedy(base_grid, height, width, goal, heuristic, buckets=False, profile=None, max_memory=None, ctx=None):
     """
     Find the shortest path from an initial state to a goal state using the Greedy Best-First Search algorithm.
 
@@ -365,6 +1308,10 @@ def greedy(base_grid, height, width, goal, heuristic):
         width (int): Number of columns in the grid.
         goal (Tuple[int, ...]): Goal state of the grid.
         heuristic (Function): Heuristic function to estimate the distance to the goal.
+        buckets (bool, optional): Use a bucket queue as open list for integer heuristics. Defaults to False.
+        profile (profiling.Profile, optional): Collect timers and counters of the search. Defaults to None.
+        max_memory (int, optional): Memory budget in bytes, see astar. Defaults to None (unbounded).
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
 
     Returns:
         Tuple[str, int, int]:
@@ -373,10 +1320,13 @@ def greedy(base_grid, height, width, goal, heuristic):
             - Space complexity (int): The maximum number of states held in memory at any one time.
     """
 
-    return astar(base_grid, height, width, goal, heuristic, use_g=False, use_h=True)
+    return astar(
+        base_grid, height, width, goal, heuristic, use_g=False, use_h=True, buckets=buckets, profile=profile,
+        max_memory=max_memory, ctx=ctx,
+    )
 
 
-def uniform_cost(base_grid, height, width, goal, heuristic):
+def uniform_cost(base_grid, height, width, goal, heuristic, buckets=False, profile=None, max_memory=None, ctx=None):
     """
     Find the shortest path from an initial state to a goal state using the Uniform Cost Search algorithm.
 
@@ -389,6 +1339,10 @@ def uniform_cost(base_grid, height, width, goal, heuristic):
         width (int): Number of columns in the grid.
         goal (Tuple[int, ...]): Goal state of the grid.
         heuristic (Function): Heuristic function to estimate the distance to the goal.
+        buckets (bool, optional): Use a bucket queue as open list for integer heuristics. Defaults to False.
+        profile (profiling.Profile, optional): Collect timers and counters of the search. Defaults to None.
+        max_memory (int, optional): Memory budget in bytes, see astar. Defaults to None (unbounded).
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
 
     Returns:
         Tuple[str, int, int]:
@@ -397,10 +1351,13 @@ def uniform_cost(base_grid, height, width, goal, heuristic):
             - Space complexity (int): The maximum number of states held in memory at any one time.
     """
 
-    return astar(base_grid, height, width, goal, heuristic, use_g=True, use_h=False)
+    return astar(
+        base_grid, height, width, goal, heuristic, use_g=True, use_h=False, buckets=buckets, profile=profile,
+        max_memory=max_memory, ctx=ctx,
+    )
 
 
-def bd_greedy(base_grid, height, width, goal, heuristic):
+def bd_greedy(base_grid, height, width, goal, heuristic, buckets=False, ctx=None):
     """
     Find the shortest path from an initial state to a goal state using the Bidirectional Greedy Best-First Search algorithm.
 
@@ -413,6 +1370,8 @@ def bd_greedy(base_grid, height, width, goal, heuristic):
         width (int): Number of columns in the grid.
         goal (Tuple[int, ...]): Goal state of the grid.
         heuristic (Function): Heuristic function to estimate the distance to the goal.
+        buckets (bool, optional): Use a bucket queue as open list for integer heuristics. Defaults to False.
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
 
     Returns:
         Tuple[str, int, int]:
@@ -421,10 +1380,10 @@ def bd_greedy(base_grid, height, width, goal, heuristic):
             - Space complexity (int): The maximum number of states held in memory at any one time.
     """
 
-    return bd_astar(base_grid, height, width, goal, heuristic, use_g=False, use_h=True)
+    return bd_astar(base_grid, height, width, goal, heuristic, use_g=False, use_h=True, buckets=buckets, ctx=ctx)
 
 
-def bd_uniform_cost(base_grid, height, width, goal, heuristic):
+def bd_uniform_cost(base_grid, height, width, goal, heuristic, buckets=False, ctx=None):
     """
     Find the shortest path from an initial state to a goal state using the Bidirectional Uniform Cost Search algorithm.
 
@@ -437,6 +1396,8 @@ def bd_uniform_cost(base_grid, height, width, goal, heuristic):
         width (int): Number of columns in the grid.
         goal (Tuple[int, ...]): Goal state of the grid.
         heuristic (Function): Heuristic function to estimate the distance to the goal.
+        buckets (bool, optional): Use a bucket queue as open list for integer heuristics. Defaults to False.
+        ctx (heuristics.Context, optional): Context of the goal holding its tables. Defaults to heuristics.context.
 
     Returns:
         Tuple[str, int, int]:
@@ -445,11 +1406,250 @@ def bd_uniform_cost(base_grid, height, width, goal, heuristic):
             - Space complexity (int): The maximum number of states held in memory at any one time.
     """
 
-    return bd_astar(base_grid, height, width, goal, heuristic, use_g=True, use_h=False)
+    return bd_astar(base_grid, height, width, goal, heuristic, use_g=True, use_h=False, buckets=buckets, ctx=ctx)
 
 
 def line_by_line(base_grid, height, width, goal, heuristic):
-    raise NotImplementedError("")
+    """
+    Find a path from an initial state to a goal state by solving the puzzle one line at a time.
+
+    The outer row or column of the unsolved region that does not hold the goal cell of the blank is solved, then the
+    region shrinks by that line, until 2x2 cells are left. Tiles are brought to their goal cell along a shortest
+    route of free cells, the blank going around them by breadth-first search. The last two tiles of a line cannot be
+    placed one after the other, so they are arranged by a breadth-first search over their positions and the blank's
+    inside a window of at most 3x3 cells at the end of the line, as are the last 2x2 cells. Every search is bounded by
+    the size of the puzzle, so the path is found in polynomial time but is not the shortest one.
+
+    Args:
+        base_grid (Tuple[int, ...]): Initial state of the grid.
+        height (int): Number of rows in the grid.
+        width (int): Number of columns in the grid.
+        goal (Tuple[int, ...]): Goal state of the grid.
+        heuristic (Function): Unused, the placement does not need an estimate.
+
+    Raises:
+        RuntimeError: If the puzzle is not solvable.
+
+    Returns:
+        Tuple[str, int, int]:
+            - Path (str): The sequence of moves to reach the goal.
+            - Time complexity (int): The number of states explored by the searches.
+            - Space complexity (int): The maximum number of states held in memory by a search.
+    """
+
+    return finish(_line_by_line_steps(base_grid, height, width, goal, heuristic))
+
+
+def _line_by_line_steps(base_grid, height, width, goal, heuristic, slice_size=None):
+    """Stepped form of line_by_line, pausing every slice_size states (see steps)"""
+
+    size = height * width
+    grid = list(base_grid)
+    cells = [0] * size
+    for cell, tile in enumerate(grid):
+        cells[tile] = cell
+
+    neighbors = [
+        [(ny * width + nx, s) for ny, nx, s in utils.moves(y, x, height, width, "")]
+        for y in range(height)
+        for x in range(width)
+    ]
+    locked = bytearray(size)
+    path = []
+    # States explored, most states held by a search and count of the next pause
+    stats = [0, 1, slice_size or math.inf]
+
+    def search(start, is_goal, expand):
+        # Breadth-first search, giving the (state, move) steps leading to the first goal state
+        parents = {start: None}
+        queue = deque((start,))
+        while queue:
+            state = queue.popleft()
+            stats[0] += 1
+            if stats[0] >= stats[2]:
+                stats[2] += slice_size
+                yield stats[0], stats[1]
+            if is_goal(state):
+                steps = []
+                while parents[state] is not None:
+                    state, step = parents[state]
+                    steps.append(step)
+                return steps[::-1]
+            for child, step in expand(state):
+                if child not in parents:
+                    parents[child] = state, step
+                    queue.append(child)
+            stats[1] = max(stats[1], len(parents))
+        raise RuntimeError("Puzzle is not solvable")
+
+    def slide(cell, s):
+        # Move the blank to a neighbor cell
+        blank = cells[0]
+        tile = grid[cell]
+        grid[blank], grid[cell] = tile, 0
+        cells[tile], cells[0] = blank, cell
+        path.append(s)
+
+    def route(start, targets, avoid=()):
+        # Shortest route of free cells from start to one of the targets, avoiding some cells
+        def expand(cell):
+            return ((n, (n, s)) for n, s in neighbors[cell] if not locked[n] and n not in avoid)
+
+        return (yield from search(start, targets.__contains__, expand))
+
+    def move_blank(targets, avoid=()):
+        for cell, s in (yield from route(cells[0], targets, avoid)):
+            slide(cell, s)
+
+    def move_tile(tile, targets):
+        for cell, _ in (yield from route(cells[tile], targets)):
+            yield from move_blank((cell,), (cells[tile],))
+            slide(cells[tile], next(s for n, s in neighbors[cells[0]] if n == cells[tile]))
+
+    def arrange(targets, window):
+        # Search the positions of the blank and of the target tiles inside the window
+        tiles = tuple(targets)
+        goal_cells = tuple(targets[tile] for tile in tiles)
+
+        def expand(state):
+            blank, positions = state
+            for n, s in neighbors[blank]:
+                if n in window and not locked[n]:
+                    yield (n, tuple(blank if p == n else p for p in positions)), (n, s)
+
+        start = (cells[0], tuple(cells[tile] for tile in tiles))
+        for cell, s in (yield from search(start, lambda state: state[1] == goal_cells, expand)):
+            slide(cell, s)
+
+    goal_blank_y, goal_blank_x = divmod(goal.index(0), width)
+    top, bottom, left, right = 0, height - 1, 0, width - 1
+
+    def at(i, d):
+        # Cell i of the line solved next, d lines inside the region
+        return origin + i * along + d * inward
+
+    if height == 1 or width == 1:
+        # Tiles of a single line keep their order
+        yield from move_blank((goal.index(0),))
+        top = bottom = left = right = None
+    while top is not None and (bottom - top > 1 or right - left > 1):
+        if bottom - top >= right - left and bottom - top > 1:
+            y, inward = (top, width) if goal_blank_y != top else (bottom, -width)
+            origin, along, length = y * width + left, 1, right - left + 1
+            top, bottom = (top + 1, bottom) if y == top else (top, bottom - 1)
+        else:
+            x, inward = (left, 1) if goal_blank_x != left else (right, -1)
+            origin, along, length = top * width + x, width, bottom - top + 1
+            left, right = (left + 1, right) if x == left else (left, right - 1)
+
+        for i in range(length - 2):
+            yield from move_tile(goal[at(i, 0)], (at(i, 0),))
+            locked[at(i, 0)] = 1
+
+        first, last = at(length - 2, 0), at(length - 1, 0)
+        if grid[first] != goal[first] or grid[last] != goal[last]:
+            window = {at(i, d) for i in range(max(0, length - 3), length) for d in range(3)}
+            yield from move_tile(goal[first], (first,))
+            locked[first] = 1
+            yield from move_tile(goal[last], window)
+            locked[first] = 0
+            placed = cells[goal[first]], cells[goal[last]]
+            yield from move_blank(window.difference(placed), placed)
+            yield from arrange({goal[first]: first, goal[last]: last}, window)
+        locked[first] = locked[last] = 1
+
+    if top is not None:
+        window = {y * width + x for y in range(top, bottom + 1) for x in range(left, right + 1)}
+        yield from arrange({goal[cell]: cell for cell in window if goal[cell]}, window)
+    if grid != list(goal):
+        raise RuntimeError("Puzzle is not solvable")
+
+    # Drop the moves undone right away
+    moves = []
+    for s in path:
+        if moves and moves[-1] == utils.invert_moves(s):
+            moves.pop()
+        else:
+            moves.append(s)
+
+    return "".join(moves), stats[0], stats[1]
+
+
+def run(algorithm, base_grid, height, width, goal, heuristic, cache=None, **options):
+    """
+    Run a solver algorithm with the options it supports, ignoring the other ones.
+
+    With a cache, a stored solution answering the request is returned without searching, exploring no states, and
+    new solutions are stored along with their optimality (see solution_cache.SolutionCache). Grids are stored as
+    their representative under the symmetries of the goal (see symmetry.canonical).
+
+    Args:
+        algorithm (Function): Solver algorithm, one of NAMES.
+        base_grid (Tuple[int, ...]): Initial state of the grid.
+        height (int): Number of rows in the grid.
+        width (int): Number of columns in the grid.
+        goal (Tuple[int, ...]): Goal state of the grid.
+        heuristic (Function): Heuristic function to estimate the distance to the goal.
+        cache (solution_cache.SolutionCache, optional): Cache of the solutions. Defaults to None.
+        **options: Keyword arguments of the algorithm (e.g. buckets).
+
+    Returns:
+        Tuple[str, int, int]: The result of the algorithm.
+    """
+
+    parameters = inspect.signature(algorithm).parameters
+    options = {k: v for k, v in options.items() if k in parameters}
+    if cache is None:
+        return algorithm(base_grid, height, width, goal, heuristic, **options)
+
+    name, heur_name = algorithm.__name__, heuristic.__name__
+    optimal = name in solution_cache.OPTIMAL or (name == "ara_star" and options.get("time_limit") is None)
+    # Mirrored grids share the entry of their representative, stored with its own moves
+    image, mirror = symmetry.canonical(height, width, base_grid, goal)
+    cache_key = solution_cache.key(height, width, image, goal)
+    moves = cache.get(cache_key, name, heur_name, optimal)
+    if moves is not None:
+        return moves.translate(mirror.backward), 0, 1
+
+    result = algorithm(base_grid, height, width, goal, heuristic, **options)
+    cache.put(cache_key, name, heur_name, optimal, result[0].translate(mirror.forward))
+    return result
+
+
+def _unsliced(algorithm, *args, **options):
+    """Stepped form of the algorithms outside of STEPS, running them in a single step"""
+
+    yield from ()
+    return algorithm(*args, **options)
+
+
+def steps(algorithm, base_grid, height, width, goal, heuristic, slice_size=4096, **options):
+    """
+    Get a search that pauses every slice_size explored states, to be resumed by its caller.
+
+    The search is a generator yielding its time and space complexities so far at each pause, and returning the
+    result of the algorithm, so that an event loop can run several searches in turns, stop one past its deadline,
+    or drop it by closing the generator. parallel_id_astar only pauses between the subtrees its workers return.
+
+    Args:
+        algorithm (Function): Solver algorithm, one of NAMES.
+        base_grid (Tuple[int, ...]): Initial state of the grid.
+        height (int): Number of rows in the grid.
+        width (int): Number of columns in the grid.
+        goal (Tuple[int, ...]): Goal state of the grid.
+        heuristic (Function): Heuristic function to estimate the distance to the goal.
+        slice_size (int, optional): Number of states explored between two pauses. Defaults to 4096.
+        **options: Keyword arguments of the algorithm, the ones it does not support are ignored (see run).
+
+    Returns:
+        Generator[Tuple[int, int], None, Tuple[str, int, int]]: The stepped search.
+    """
+
+    parameters = inspect.signature(algorithm).parameters
+    options = {k: v for k, v in options.items() if k in parameters}
+    if algorithm not in STEPS:
+        return _unsliced(algorithm, base_grid, height, width, goal, heuristic, **options)
+    return STEPS[algorithm](base_grid, height, width, goal, heuristic, slice_size=slice_size, **options)
 
 
 DEFAULT = "greedy"
@@ -457,13 +1657,121 @@ NAMES = {
     f.__name__: f
     for f in (
         astar,
+        batch_astar,
+        ara_star,
         greedy,
         uniform_cost,
         id_astar,
         id_astar_rec,
+        parallel_id_astar,
         bd_astar,
+        bd_mm,
         bd_greedy,
         bd_uniform_cost,
         line_by_line,
     )
 }
+STEPS = {
+    astar: _astar_steps,
+    batch_astar: _batch_astar_steps,
+    ara_star: _ara_star_steps,
+    greedy: partial(_astar_steps, use_g=False),
+    uniform_cost: partial(_astar_steps, use_h=False),
+    id_astar: _id_astar_steps,
+    id_astar_rec: _id_astar_rec_steps,
+    parallel_id_astar: _parallel_id_astar_steps,
+    bd_astar: _bd_astar_steps,
+    bd_mm: _bd_mm_steps,
+    bd_greedy: partial(_bd_astar_steps, use_g=False),
+    bd_uniform_cost: partial(_bd_astar_steps, use_h=False),
+    line_by_line: _line_by_line_steps,
+}
+
+
+class Solver:
+    """Solver of the puzzles of one goal
+
+    The heuristic context of the goal is built when the solver is created instead of on the first search, along
+    with the pattern databases, walking distance tables and batch arrays the context keeps (see heuristics.Context).
+    The solver holds the context and passes it to each search, so its tables stay loaded as long as the solver
+    lives, whatever other goals go through the cache of heuristics.context. It holds no state between two solves.
+
+    Attributes:
+        ctx (heuristics.Context): Heuristic context of the goal
+    """
+
+    def __init__(self, height, width, goal=None, algorithm=DEFAULT, heuristic=heuristics.DEFAULT, cache=None, **options):
+        """
+        Args:
+            height (int): Number of rows in the grid.
+            width (int): Number of columns in the grid.
+            goal (Sequence[int], optional): Goal state of the grid. Defaults to the spiral goal (see generator.make_goal).
+            algorithm (Union[str, Function], optional): Solver algorithm or its name in NAMES. Defaults to DEFAULT.
+            heuristic (Union[str, Function], optional): Heuristic function or its name in heuristics.NAMES.
+                Defaults to heuristics.DEFAULT.
+            cache (solution_cache.SolutionCache, optional): Cache of the solutions. Defaults to None.
+            **options: Keyword arguments of the algorithm (see run).
+
+        Raises:
+            ValueError: If the goal does not fit the dimensions
+        """
+
+        if goal is None:
+            goal = generator.make_goal(height, width)
+        if sorted(goal) != list(range(height * width)):
+            raise ValueError("Invalid goal")
+
+        self.height = height
+        self.width = width
+        self.goal = tuple(goal)
+        self.algorithm = NAMES[algorithm] if isinstance(algorithm, str) else algorithm
+        self.heuristic = heuristics.NAMES[heuristic] if isinstance(heuristic, str) else heuristic
+        self.cache = cache
+        self.options = options
+
+        # Evaluating the heuristic on the goal builds or loads its tables into the context
+        self.ctx = heuristics.context(height, width, self.goal)
+        self.heuristic(list(self.goal), self.ctx)
+        move_pruning.automaton(options.get("pruning_length", 2))
+        symmetry.group(height, width, self.goal)
+        if self.algorithm is batch_astar and vectorized.available():
+            vectorized.tables(self.ctx)
+
+    def solve(self, puzzle):
+        """
+        Solve a puzzle.
+
+        Args:
+            puzzle (Sequence[int]): Initial state of the grid.
+
+        Raises:
+            ValueError: If the puzzle does not fit the dimensions
+            RuntimeError: If the puzzle is not solvable
+
+        Returns:
+            Tuple[str, int, int]: The result of the algorithm (see run).
+        """
+
+        if sorted(puzzle) != list(range(self.height * self.width)):
+            raise ValueError("Invalid puzzle")
+        if not utils.is_solvable(list(puzzle), list(self.goal), self.width):
+            raise RuntimeError("Puzzle is not solvable")
+
+        return run(
+            self.algorithm, tuple(puzzle), self.height, self.width, self.goal, self.heuristic, cache=self.cache,
+            ctx=self.ctx, **self.options
+        )
+
+    def solve_many(self, puzzles):
+        """
+        Solve puzzles one after the other.
+
+        Args:
+            puzzles (Iterable[Sequence[int]]): Initial states of the grid.
+
+        Yields:
+            Tuple[str, int, int]: The result of the algorithm for each puzzle, in order.
+        """
+
+        for puzzle in puzzles:
+            yield self.solve(puzzle)
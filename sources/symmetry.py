@@ -0,0 +1,124 @@
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+from functools import lru_cache
+
+
+# Direction of the blank for each move
+DIRECTIONS = {"^": (-1, 0), "v": (1, 0), "<": (0, -1), ">": (0, 1)}
+
+
+class Symmetry(NamedTuple):
+    """Symmetry of the grid preserving a goal
+
+    The cell c of a grid goes to cells[c] and its tile t is renamed tiles[t], the renamed goal being the goal itself.
+    A path of a grid becomes a path of its image by translating its moves with forward, and back with backward.
+
+    Attributes:
+        cells (Tuple[int, ...]): Image of each cell
+        tiles (Tuple[int, ...]): New name of each tile
+        forward (Dict[int, int]): Translation table (see str.translate) of the moves to the image
+        backward (Dict[int, int]): Translation table of the moves of the image back to the grid
+    """
+
+    cells: Tuple[int, ...]
+    tiles: Tuple[int, ...]
+    forward: Dict[int, int]
+    backward: Dict[int, int]
+
+
+def transforms(height: int, width: int) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Get the linear parts of the geometric symmetries of a grid: the identity, reflections and rotations
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+
+    Returns:
+        List[Tuple[Tuple[int, int], Tuple[int, int]]]: Rows of the 2x2 matrix of each symmetry, over (y, x)
+    """
+
+    result = [((1, 0), (0, 1)), ((1, 0), (0, -1)), ((-1, 0), (0, 1)), ((-1, 0), (0, -1))]
+    if height == width:
+        # Reflections over the diagonals and quarter turns only fit square grids
+        result += [((0, 1), (1, 0)), ((0, -1), (-1, 0)), ((0, 1), (-1, 0)), ((0, -1), (1, 0))]
+    return result
+
+
+@lru_cache(maxsize=8)
+def group(height: int, width: int, goal: Tuple[int, ...]) -> Tuple[Symmetry, ...]:
+    """Get the symmetries preserving a goal, the identity first
+
+    A geometric symmetry keeping the goal cell of the blank preserves the goal once the tiles are renamed after the
+    tiles of the goal they land on. A grid and its image are then the same number of moves away from the goal.
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Tuple[int, ...]): Goal state
+
+    Returns:
+        Tuple[Symmetry, ...]: Symmetries of the goal
+    """
+
+    result = []
+    for (a, b), (c, d) in transforms(height, width):
+        # Offsets bringing the image of the grid back onto the cells
+        oy = -min(0, a * (height - 1)) - min(0, b * (width - 1))
+        ox = -min(0, c * (height - 1)) - min(0, d * (width - 1))
+        cells = tuple(
+            (a * y + b * x + oy) * width + c * y + d * x + ox for y in range(height) for x in range(width)
+        )
+        if cells[goal.index(0)] != goal.index(0):
+            continue
+
+        tiles = [0] * len(goal)
+        for cell, tile in enumerate(goal):
+            tiles[tile] = goal[cells[cell]]
+        moves = {
+            s: next(m for m, v in DIRECTIONS.items() if v == (a * dy + b * dx, c * dy + d * dx))
+            for s, (dy, dx) in DIRECTIONS.items()
+        }
+        result.append(
+            Symmetry(
+                cells,
+                tuple(tiles),
+                str.maketrans(moves),
+                str.maketrans({m: s for s, m in moves.items()}),
+            )
+        )
+    return tuple(result)
+
+
+def apply(symmetry: Symmetry, grid: Sequence[int]) -> Tuple[int, ...]:
+    """Get the image of a grid by a symmetry
+
+    Args:
+        symmetry (Symmetry): Symmetry of the goal
+        grid (Sequence[int]): State of the puzzle
+
+    Returns:
+        Tuple[int, ...]: Image of the grid
+    """
+
+    image = [0] * len(grid)
+    for cell, tile in enumerate(grid):
+        image[symmetry.cells[cell]] = symmetry.tiles[tile]
+    return tuple(image)
+
+
+def canonical(height: int, width: int, grid: Sequence[int], goal: Sequence[int]) -> Tuple[Tuple[int, ...], Symmetry]:
+    """Get the canonical representative of a grid, its smallest image by the symmetries of the goal
+
+    Grids mirroring each other relative to the goal share their representative, whose paths are translated back to
+    each of them with the backward table of the returned symmetry.
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        grid (Sequence[int]): State of the puzzle
+        goal (Sequence[int]): Goal state
+
+    Returns:
+        Tuple[Tuple[int, ...], Symmetry]: Representative and symmetry mapping the grid to it
+    """
+
+    return min(((apply(s, grid), s) for s in group(height, width, tuple(goal))), key=lambda image: image[0])
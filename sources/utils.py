@@ -1,5 +1,8 @@
-from typing import List, Generator, Tuple
+from typing import List, Generator, Sequence, Tuple
 from math import log10
+import resource
+import sys
+import os
 
 
 def inversions_parity(puzzle: List[int]) -> int:
@@ -133,3 +136,100 @@ def moves(
     for ny, nx, s in ((y + 1, x, "v"), (y - 1, x, "^"), (y, x + 1, ">"), (y, x - 1, "<")):
         if 0 <= ny < height and 0 <= nx < width and s != inv_last:
             yield (ny, nx, s)
+
+
+def cell_bits(size: int) -> int:
+    """Get the number of bits needed to store any tile of a puzzle
+
+    Args:
+        size (int): Number of cells in the puzzle
+
+    Returns:
+        int: Bits per cell in a packed state
+    """
+
+    return max(1, (size - 1).bit_length())
+
+
+def pack(grid: List[int], bits: int) -> int:
+    """Pack a grid into a single integer, cell i being stored at bits [i * bits, (i + 1) * bits)
+
+    Packed states hash and compare without touching every cell, and sliding the tile at cell n into the blank
+    at cell b is state + (tile << b * bits) - (tile << n * bits).
+
+    Args:
+        grid (List[int]): Grid to pack
+        bits (int): Bits per cell
+
+    Returns:
+        int: Packed state
+    """
+
+    state = 0
+    for i, e in enumerate(grid):
+        state |= e << (i * bits)
+    return state
+
+
+def unpack(state: int, size: int, bits: int) -> List[int]:
+    """Unpack a state packed by pack
+
+    Args:
+        state (int): Packed state
+        size (int): Number of cells in the puzzle
+        bits (int): Bits per cell
+
+    Returns:
+        List[int]: Grid
+    """
+
+    mask = (1 << bits) - 1
+    return [state >> (i * bits) & mask for i in range(size)]
+
+
+def trace(parents: Sequence[int], moves: bytes, node: int) -> str:
+    """Rebuild the sequence of moves leading to a search node
+
+    Search nodes only store the index of their parent and the move (^v><) leading to them,
+    roots being their own parent.
+
+    Args:
+        parents (Sequence[int]): Parent index of each node
+        moves (bytes): Move leading to each node
+        node (int): Index of the node
+
+    Returns:
+        str: Sequence of moves from the root to the node
+    """
+
+    path = bytearray()
+    while parents[node] != node:
+        path.append(moves[node])
+        node = parents[node]
+    return path[::-1].decode()
+
+
+def peak_memory() -> int:
+    """Get the peak resident memory of the process
+
+    Returns:
+        int: Peak resident set size in bytes
+    """
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def memory_usage() -> int:
+    """Get the current resident memory of the process, or its peak where it cannot be read
+
+    Returns:
+        int: Resident set size in bytes
+    """
+
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_memory()
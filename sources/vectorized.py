@@ -0,0 +1,149 @@
+from typing import Callable, Dict
+from . import heuristics
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# States are rows of a 2-D array with one cell per column, tiles must fit in DTYPE
+DTYPE = "uint8"
+
+
+def available() -> bool:
+    """Check whether NumPy is installed
+
+    Returns:
+        bool: Availability of the batch heuristics
+    """
+
+    return np is not None
+
+
+def tables(ctx: heuristics.Context) -> Dict[str, "np.ndarray"]:
+    """Convert the lookup tables of a heuristic context to arrays, kept in the context once built
+
+    Per tile tables are indexed by tile, per (tile, cell) tables by [tile, cell], the blank always costs 0.
+
+    Args:
+        ctx (heuristics.Context): Heuristic context of the goal
+
+    Returns:
+        Dict[str, np.ndarray]: Goal row and column of each tile, and the manhattan, chebyshev, euclidean and
+            misplaced costs of each tile on each cell
+    """
+
+    if np is None:
+        raise RuntimeError("NumPy is required by the batch heuristics")
+
+    arrays = ctx.tables.get("vectorized")
+    if arrays is None:
+        arrays = ctx.tables["vectorized"] = _arrays(ctx)
+    return arrays
+
+
+def _arrays(ctx: heuristics.Context) -> Dict[str, "np.ndarray"]:
+    return {
+        "goal_rows": np.array([y for y, _ in ctx.gpos]),
+        "goal_cols": np.array([x for _, x in ctx.gpos]),
+        "manhattan": np.array(ctx.manhattan),
+        "chebyshev": np.array(ctx.chebyshev),
+        "euclidean": np.array(ctx.euclidean),
+        "misplaced": np.array(ctx.misplaced),
+    }
+
+
+def _cost(name: str, states: "np.ndarray", ctx: heuristics.Context) -> "np.ndarray":
+    """Sum a per (tile, cell) table over each state"""
+
+    table = tables(ctx)[name]
+    return table[states, np.arange(states.shape[1])].sum(axis=1)
+
+
+def manhattan(states: "np.ndarray", ctx: heuristics.Context) -> "np.ndarray":
+    return _cost("manhattan", states, ctx)
+
+
+def euclidean(states: "np.ndarray", ctx: heuristics.Context) -> "np.ndarray":
+    return _cost("euclidean", states, ctx)
+
+
+def chebyshev(states: "np.ndarray", ctx: heuristics.Context) -> "np.ndarray":
+    return _cost("chebyshev", states, ctx)
+
+
+def misplaced(states: "np.ndarray", ctx: heuristics.Context) -> "np.ndarray":
+    return _cost("misplaced", states, ctx)
+
+
+def _line_costs(own: "np.ndarray", order: "np.ndarray", tiles: "np.ndarray") -> "np.ndarray":
+    """Get the linear conflict cost of each line, as heuristics._line_cost
+
+    The longest increasing subsequence of the tiles belonging to each line is computed by dynamic programming
+    over the cells of the lines, every state and line at once.
+
+    Args:
+        own (np.ndarray): Goal line of each tile, shaped (states, lines, cells)
+        order (np.ndarray): Goal position of each tile along its line, shaped like own
+        tiles (np.ndarray): Tiles, shaped like own
+
+    Returns:
+        np.ndarray: Linear conflict cost of each state
+    """
+
+    in_line = (tiles != 0) & (own == np.arange(own.shape[1])[None, :, None])
+    # Longest increasing subsequence ending on each cell, 0 for tiles outside of their line
+    longest = np.zeros(own.shape, dtype=np.int64)
+    for j in range(own.shape[2]):
+        before = longest[..., :j] * (order[..., :j] < order[..., j : j + 1])
+        longest[..., j] = in_line[..., j] * (1 + before.max(axis=2, initial=0))
+    return 2 * (in_line.sum(axis=2) - longest.max(axis=2)).sum(axis=1)
+
+
+def manhattan_with_lc(states: "np.ndarray", ctx: heuristics.Context) -> "np.ndarray":
+    t = tables(ctx)
+    grids = states.reshape(len(states), ctx.height, ctx.width)
+    goal_rows, goal_cols = t["goal_rows"][grids], t["goal_cols"][grids]
+    lc = _line_costs(goal_rows, goal_cols, grids)
+    lc += _line_costs(goal_cols.transpose(0, 2, 1), goal_rows.transpose(0, 2, 1), grids.transpose(0, 2, 1))
+    return manhattan(states, ctx) + lc
+
+
+def best(states: "np.ndarray", ctx: heuristics.Context) -> "np.ndarray":
+    return np.maximum.reduce([f(states, ctx) for f in (euclidean, misplaced, chebyshev, manhattan_with_lc)])
+
+
+def batch(heuristic: Callable) -> Callable:
+    """Get the batch form of a heuristic
+
+    The returned function takes (states, ctx), states being a 2-D array with one state per row, and gives
+    the heuristic of every state as a 1-D array. Heuristics without a batch form are evaluated row by row.
+
+    Args:
+        heuristic (Callable): Heuristic function
+
+    Returns:
+        Callable: Batch function of the heuristic
+    """
+
+    if np is None:
+        raise RuntimeError("NumPy is required by the batch heuristics")
+
+    if heuristic in BATCHES:
+        return BATCHES[heuristic]
+
+    def rows(states, ctx):
+        return np.array([heuristic(row, ctx) for row in states.tolist()])
+
+    return rows
+
+
+BATCHES = {
+    heuristics.manhattan: manhattan,
+    heuristics.euclidean: euclidean,
+    heuristics.misplaced: misplaced,
+    heuristics.chebyshev: chebyshev,
+    heuristics.manhattan_with_lc: manhattan_with_lc,
+    heuristics.best: best,
+}
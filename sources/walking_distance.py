@@ -0,0 +1,259 @@
+from typing import Dict, Optional, Sequence, Tuple
+from array import array
+import hashlib
+import os
+from . import pattern_database
+
+
+# Upper bound of a walking distance table, in abstract states
+MAX_STATES = 4_000_000
+
+MAGIC = b"NPWD\x01"
+HEADER_SIZE = 8
+
+
+def goal_lines(height: int, width: int, goal: Sequence[int], column: bool) -> Tuple[int, ...]:
+    """Get the goal row (or column) of each tile
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Sequence[int]): Goal state
+        column (bool): Columns instead of rows
+
+    Returns:
+        Tuple[int, ...]: Goal line of each tile
+    """
+
+    lines = [0] * (height * width)
+    for i, e in enumerate(goal):
+        lines[e] = i % width if column else i // width
+    return tuple(lines)
+
+
+def key(grid: Sequence[int], width: int, lines: Tuple[int, ...], count: int, column: bool) -> bytearray:
+    """Get the abstract state of a grid in a walking distance table
+
+    The abstract state holds, for each line and each goal line, the number of tiles of the line belonging to the
+    goal line, followed by the line of the blank. Lines are rows, or columns if column is set.
+
+    Args:
+        grid (Sequence[int]): State of the puzzle
+        width (int): Number of columns in the puzzle
+        lines (Tuple[int, ...]): Goal line of each tile (see goal_lines)
+        count (int): Number of lines
+        column (bool): Columns instead of rows
+
+    Returns:
+        bytearray: Abstract state
+    """
+
+    state = bytearray(count * count + 1)
+    for i, e in enumerate(grid):
+        line = i % width if column else i // width
+        if e:
+            state[line * count + lines[e]] += 1
+        else:
+            state[-1] = line
+    return state
+
+
+def build(height: int, width: int, goal: Sequence[int], column: bool) -> Dict[bytes, int]:
+    """Build a walking distance table by breadth-first search from the goal
+
+    A move takes any tile of a line next to the blank's line into the blank's line, whatever its position inside
+    the line, so the distance of an abstract state is a lower bound of the vertical (or horizontal) moves needed.
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Sequence[int]): Goal state
+        column (bool): Columns instead of rows
+
+    Raises:
+        RuntimeError: If the table has more than MAX_STATES abstract states
+
+    Returns:
+        Dict[bytes, int]: Distance of each abstract state (see key)
+    """
+
+    lines = goal_lines(height, width, goal, column)
+    count = width if column else height
+    start = bytes(key(goal, width, lines, count, column))
+
+    table = {start: 0}
+    layer = [start]
+    cost = 0
+    while layer:
+        cost += 1
+        upper = []
+        for state in layer:
+            blank = state[-1]
+            for line in (blank - 1, blank + 1):
+                if not 0 <= line < count:
+                    continue
+                for g in range(count):
+                    if not state[line * count + g]:
+                        continue
+                    new_state = bytearray(state)
+                    new_state[line * count + g] -= 1
+                    new_state[blank * count + g] += 1
+                    new_state[-1] = line
+                    new_state = bytes(new_state)
+                    if new_state not in table:
+                        table[new_state] = cost
+                        upper.append(new_state)
+        if len(table) > MAX_STATES:
+            raise RuntimeError(f"Walking distance tables are too large for a {height}x{width} puzzle")
+        layer = upper
+
+    return table
+
+
+def graph(table: Dict[bytes, int], count: int) -> Tuple[Dict[bytes, int], array, array]:
+    """Number the abstract states of a walking distance table and link each of them to its neighbours
+
+    Searches carry the numbers of the row and column abstract states of each node, so that a move is one lookup in
+    links. The link of the state i when the blank goes up (direction 0) or down (1) the lines, taking a tile of goal
+    line g, is at (i * 2 + direction) * count + g, -1 if there is no such tile.
+
+    Args:
+        table (Dict[bytes, int]): Walking distance table (see build)
+        count (int): Number of lines
+
+    Returns:
+        Tuple[Dict[bytes, int], array, array]: Number of each abstract state, distance and links of each number
+    """
+
+    index = {state: i for i, state in enumerate(table)}
+    distances = array("B", table.values())
+    links = array("i", [-1]) * (len(table) * 2 * count)
+    for state, i in index.items():
+        blank = state[-1]
+        for direction, line in enumerate((blank - 1, blank + 1)):
+            if not 0 <= line < count:
+                continue
+            for g in range(count):
+                if not state[line * count + g]:
+                    continue
+                new_state = bytearray(state)
+                new_state[line * count + g] -= 1
+                new_state[blank * count + g] += 1
+                new_state[-1] = line
+                links[(i * 2 + direction) * count + g] = index[bytes(new_state)]
+    return index, distances, links
+
+
+def cache_path(directory: str, height: int, width: int, goal: Sequence[int], column: bool) -> str:
+    """Get the cache file of a walking distance table
+
+    Args:
+        directory (str): Cache directory
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Sequence[int]): Goal state
+        column (bool): Columns instead of rows
+
+    Returns:
+        str: Path of the cache file
+    """
+
+    lines = goal_lines(height, width, goal, column)
+    name = f"{height}x{width}:{'columns' if column else 'rows'}:{','.join(map(str, lines))}"
+    digest = hashlib.sha256(name.encode()).hexdigest()[:24]
+    return os.path.join(directory, f"{height}x{width}-{digest}.wd")
+
+
+def save(path: str, table: Dict[bytes, int]) -> None:
+    """Write a walking distance table to a cache file, as the abstract states followed by their distance
+
+    Args:
+        path (str): Path of the cache file
+        table (Dict[bytes, int]): Walking distance table
+
+    Raises:
+        ValueError: If a distance does not fit in a byte
+    """
+
+    size = len(next(iter(table))) + 1
+    header = MAGIC + bytes((size,)) + b"\0" * (HEADER_SIZE - len(MAGIC) - 1)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(b"".join(state + bytes((distance,)) for state, distance in table.items()))
+    os.replace(tmp, path)
+
+
+def load(path: str) -> Optional[Dict[bytes, int]]:
+    """Read a walking distance table from a cache file
+
+    Args:
+        path (str): Path of the cache file
+
+    Returns:
+        Optional[Dict[bytes, int]]: Walking distance table, None if the file is missing or invalid
+    """
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if len(data) < HEADER_SIZE or data[: len(MAGIC)] != MAGIC or not data[len(MAGIC)]:
+        return None
+    size = data[len(MAGIC)]
+    if (len(data) - HEADER_SIZE) % size:
+        return None
+
+    # Keep recently used tables away from eviction (see pattern_database.evict)
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    return {
+        data[i : i + size - 1]: data[i + size - 1]
+        for i in range(HEADER_SIZE, len(data), size)
+    }
+
+
+def tables(
+    height: int, width: int, goal: Sequence[int], cache_dir: Optional[str] = ""
+) -> Tuple[Dict[bytes, int], Dict[bytes, int]]:
+    """Build the row and column walking distance tables of a goal, or load them from the cache
+
+    Args:
+        height (int): Number of rows in the puzzle
+        width (int): Number of columns in the puzzle
+        goal (Sequence[int]): Goal state
+        cache_dir (str, optional): Cache directory, None to disable the cache. Defaults to pattern_database.CACHE_DIR.
+
+    Returns:
+        Tuple[Dict[bytes, int], Dict[bytes, int]]: Row and column tables
+    """
+
+    if cache_dir == "":
+        cache_dir = pattern_database.CACHE_DIR
+
+    result = []
+    paths = []
+    for column in (False, True):
+        table = None
+        if cache_dir is not None:
+            path = cache_path(cache_dir, height, width, goal, column)
+            paths.append(path)
+            table = load(path)
+
+        if table is None:
+            table = build(height, width, goal, column)
+            if cache_dir is not None:
+                try:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    save(path, table)
+                    pattern_database.evict(cache_dir, keep=paths)
+                except (OSError, ValueError):
+                    pass
+        result.append(table)
+
+    return result[0], result[1]
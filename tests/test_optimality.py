@@ -0,0 +1,30 @@
+import random
+import pytest
+from sources import generator, heuristics, solver
+
+
+# Puzzles whose float heuristic sums drift past an integer f cost
+DRIFTING = [
+    ((2, 5, 1, 7, 6, 3, 0, 4), 2, 4, (1, 2, 3, 4, 0, 7, 6, 5)),
+    ((2, 5, 0, 4, 6, 7, 1, 3), 4, 2, (1, 2, 0, 3, 7, 4, 6, 5)),
+]
+
+
+def _puzzles():
+    random.seed(7)
+    puzzles = list(DRIFTING)
+    for height, width in ((2, 4), (4, 2), (3, 3)):
+        goal = tuple(generator.make_goal(height, width))
+        for _ in range(4):
+            puzzles.append((tuple(generator.generate(height, width, list(goal))), height, width, goal))
+    return puzzles
+
+
+@pytest.mark.parametrize("algorithm", ["id_astar", "id_astar_rec", "parallel_id_astar"])
+@pytest.mark.parametrize("heuristic", ["euclidean", "best"])
+def test_ida_star_optimal_with_float_heuristics(algorithm, heuristic):
+    options = {"jobs": 1} if algorithm == "parallel_id_astar" else {}
+    for puzzle, height, width, goal in _puzzles():
+        expected = solver.astar(puzzle, height, width, goal, heuristics.NAMES[heuristic])[0]
+        path = solver.NAMES[algorithm](puzzle, height, width, goal, heuristics.NAMES[heuristic], **options)[0]
+        assert len(path) == len(expected), (puzzle, goal)